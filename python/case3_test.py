@@ -51,293 +51,522 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import mysql.connector
+import contextlib
+import io
+import math
+import multiprocessing
+from array import array
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
-from python.utils.lock_manager import DistributedLockManager
-from python.db.db_config import get_node_config, NODE_CONFIGS
+
+# MySQL error numbers for lock wait timeout (1205) and deadlock (1213)
+LOCK_CONTENTION_ERRNOS = (1205, 1213)
+
+# snapshot_original_row result for a node that could not be read; nothing is restored there
+ROW_UNREADABLE = object()
+
+# Columns of the per-transaction summary table printed by display_results
+SUMMARY_COLUMNS = ['Transaction', 'Type', 'Node', 'Status', 'Duration (s)', 'Before→After', 'Error']
+
+def print_table(rows, headers):
+    """Print rows as a fixed-width text table (the tables here are ~10 rows, no need for pandas)"""
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [max([len(header)] + [len(row[i]) for row in rows]) for i, header in enumerate(headers)]
+    print(' '.join(header.ljust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print(' '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+def time_span(results):
+    """
+    Return (earliest_start, latest_end, total_duration) over a results dict in one pass
+    """
+    earliest_start, latest_end, total_duration = math.inf, -math.inf, 0.0
+    for r in results.values():
+        earliest_start = min(earliest_start, r['start_time'])
+        latest_end = max(latest_end, r['end_time'])
+        total_duration += r['duration']
+    return earliest_start, latest_end, total_duration
+
+# Metrics averaged (mean) or totalled (sum) per isolation level in the comparison table
+COMPARISON_AGGREGATES = (
+    ('throughput', 'mean'),
+    ('avg_response_time', 'mean'),
+    ('success_rate', 'mean'),
+    ('failed_txns', 'sum'),
+    ('write_conflicts', 'sum'),
+    ('rejected_txns', 'sum'),
+)
+
+def aggregate_metrics(metric_rows):
+    """
+    Aggregate (isolation_level, metrics) rows per isolation level in one pass,
+    as listed in COMPARISON_AGGREGATES
+
+    Returns:
+        dict of isolation_level -> {metric: aggregated value}
+    """
+    totals = {}
+    counts = {}
+    for iso_level, metrics in metric_rows:
+        level_totals = totals.setdefault(iso_level, {key: 0 for key, _ in COMPARISON_AGGREGATES})
+        for key, _ in COMPARISON_AGGREGATES:
+            level_totals[key] += metrics[key]
+        counts[iso_level] = counts.get(iso_level, 0) + 1
+
+    return {
+        iso_level: {
+            key: level_totals[key] / counts[iso_level] if how == 'mean' else level_totals[key]
+            for key, how in COMPARISON_AGGREGATES
+        }
+        for iso_level, level_totals in totals.items()
+    }
 
 class ConcurrentWriteTest:
-    def __init__(self):
-        self.results = {}
+    def __init__(self, simulate_work_s=0.0, verbose=False, max_queue_depth=None):
+        """
+        Args:
+            simulate_work_s: Seconds each transaction holds its row lock after
+                writing, to force overlap between writers (default: 0, no hold)
+            verbose: Print per-transaction progress lines (default: False, so
+                timed runs don't contend on stdout)
+            max_queue_depth: Reject a transaction (QUEUE_FULL) instead of waiting when
+                this many transactions already wait for the same lock (default: no limit)
+        """
+        # Database modules are imported here, not at module level, so importing this
+        # file (e.g. to reuse print_table or the class definition) stays cheap
+        from python.db.db_config import get_node_config
+
+        self.simulate_work = simulate_work_s
+        self.verbose = verbose
         self.lock = threading.Lock()
+        self.max_queue_depth = max_queue_depth
+        self.lock_waiters = {}  # Transactions waiting in GET_LOCK: {(node, resource_id): count}
+        self._reset_results()
 
         # Get database configs from db_config.py
-        # Build node_configs dict for lock manager
         self.node_configs = {
             1: get_node_config(1),
             2: get_node_config(2),
             3: get_node_config(3)
         }
 
-        # Initialize distributed lock manager
-        self.lock_manager = DistributedLockManager(self.node_configs, current_node_id="case3_test")
+        # Connection pools per node, created on first use (sized above the 4 writers per node).
+        # Sessions are not reset on return, so the isolation level applied to each
+        # server connection is tracked to skip re-issuing the same SET statements.
+        self.pools = {}
+        self.session_isolation = {}
+        self.prepared_cursors = {}
+
+        # Worker threads reused across every run (10 transactions per run)
+        self.executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="case3")
+
+    def _log(self, transaction_id, message, timestamp=False):
+        """Print a progress line for a transaction when verbose output is enabled"""
+        if not self.verbose:
+            return
+        if timestamp:
+            message += f" at {datetime.now().strftime('%H:%M:%S.%f')[:-3]}"
+        print(f"[{transaction_id}] {message}")
+
+    def get_connection(self, node_num):
+        """Borrow a connection to a node from its pool"""
+        from mysql.connector import pooling
+
+        with self.lock:
+            if node_num not in self.pools:
+                self.pools[node_num] = pooling.MySQLConnectionPool(
+                    pool_name=f"case3_node{node_num}",
+                    pool_size=5,
+                    pool_reset_session=False,
+                    **self.node_configs[node_num]
+                )
+            pool = self.pools[node_num]
+        return pool.get_connection()
+
+    def get_prepared_cursor(self, conn, node_num, statement):
+        """
+        Return a prepared cursor for a statement on this pooled connection.
+        The cursor is kept (not closed) so the server-side statement is prepared
+        once per connection and only executed with new parameters afterwards.
+        """
+        cursor_key = (node_num, conn.connection_id, statement)
+        cursor = self.prepared_cursors.get(cursor_key)
+        if cursor is None:
+            cursor = conn.cursor(prepared=True)
+            self.prepared_cursors[cursor_key] = cursor
+        return cursor
+
+    def _reset_results(self):
+        """Clear the per-transaction results and their running aggregates before a run"""
+        self.results = {}
+        # Preallocated result slots, one per queued transaction (see _assign_result_slots)
+        self._result_slots = []
+        self._slot_of = {}
+        # Metric aggregates updated as transactions finish, so calculate_metrics
+        # does not have to scan the results afterwards
+        self._agg_min_start = math.inf
+        self._agg_max_end = -math.inf
+        self._agg_sum_duration = 0.0
+        self._agg_success_count = 0
+        self._agg_fail_count = 0
+        self._agg_rejected_count = 0
+
+    def _assign_result_slots(self, tasks):
+        """
+        Give every queued (function, transaction_id, args) task its own result slot,
+        so workers store results without sharing (and resizing) the results dict.
+        """
+        self._result_slots = [None] * len(tasks)
+        self._slot_of = {txn_id: slot for slot, (_, txn_id, _) in enumerate(tasks)}
+
+    def _collect_result_slots(self):
+        """Build self.results from the filled slots, in queue order"""
+        self.results = {r['txn_id']: r for r in self._result_slots if r is not None}
+
+    def _record_result(self, transaction_id, result):
+        """Store a finished transaction's result (called from worker threads)"""
+        slot = self._slot_of.get(transaction_id)
+        if slot is not None:
+            # Each worker owns its slot, no lock needed
+            self._result_slots[slot] = result
+
+        with self.lock:
+            if slot is None:
+                self.results[transaction_id] = result
+            self._agg_min_start = min(self._agg_min_start, result['start_time'])
+            self._agg_max_end = max(self._agg_max_end, result['end_time'])
+            self._agg_sum_duration += result['duration']
+            if result['status'] == 'SUCCESS':
+                self._agg_success_count += 1
+            else:
+                self._agg_fail_count += 1
+                if result.get('error_category') == 'QUEUE_FULL':
+                    self._agg_rejected_count += 1
+
+    def _server_lock_name(self, node_num, resource_id):
+        """Scope a resource lock name to the node's database (GET_LOCK names are server-wide)"""
+        return f"{self.node_configs[node_num]['database']}.{resource_id}"
 
-    def write_transaction(self, node_num, trans_id, new_amount, transaction_id, isolation_level):
-        """Execute a write (UPDATE) transaction on specified node with distributed locking"""
-        start_time = time.time()
-        config = self.node_configs[node_num]
+    def acquire_resource_lock(self, conn, node_num, resource_id, timeout=30):
+        """
+        Lock a resource on one node with MySQL's GET_LOCK on the transaction's own connection.
+        lock_manager.acquire_lock() only ever locks on the single node it is given, so a
+        server-side named lock gives the same guarantee in one round trip, with no polling
+        of the distributed_lock table. The lock is freed automatically if the session dies.
+
+        Returns:
+            bool: True if the lock was acquired within timeout seconds
+
+        Raises:
+            Exception: "Lock queue full ..." if max_queue_depth transactions already wait
+        """
+        waiter_key = (node_num, resource_id)
+        with self.lock:
+            waiting = self.lock_waiters.get(waiter_key, 0)
+            if self.max_queue_depth is not None and waiting >= self.max_queue_depth:
+                raise Exception(f"Lock queue full for {resource_id} on Node {node_num} ({waiting} waiting)")
+            self.lock_waiters[waiter_key] = waiting + 1
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (self._server_lock_name(node_num, resource_id), timeout))
+            acquired = cursor.fetchone()[0]
+            cursor.close()
+        finally:
+            with self.lock:
+                self.lock_waiters[waiter_key] -= 1
+        return acquired == 1
+
+    def release_resource_lock(self, conn, node_num, resource_id):
+        """Release a lock taken with acquire_resource_lock on the same connection"""
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (self._server_lock_name(node_num, resource_id),))
+            cursor.fetchone()
+            cursor.close()
+        except Exception as e:
+            print(f"Warning: Could not release lock on {resource_id} at Node {node_num}: {e}")
+
+    def session_setup_sql(self, session_key, isolation_level):
+        """
+        Return the SET statements (as a multi-statement prefix) a pooled session
+        still needs for an isolation level, or "" if it already uses it.
+        session_key is (node_num, connection_id): connection ids are only unique per server.
+        """
+        if self.session_isolation.get(session_key) == isolation_level:
+            return ""
+
+        # For SERIALIZABLE, keep innodb_lock_wait_timeout short so contended waits fail fast
+        # as LOCK_CONTENTION (innodb_deadlock_detect is global-only and left to the server)
+        lock_wait_timeout = "5" if isolation_level == 'SERIALIZABLE' else "DEFAULT"
+        return (
+            f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}; "
+            f"SET SESSION innodb_lock_wait_timeout = {lock_wait_timeout}; "
+        )
+
+    def write_transaction(self, node_num, trans_id, new_amount, transaction_id, isolation_level, start_at=0.0):
+        """
+        Execute a write (UPDATE) transaction on specified node, holding a GET_LOCK row lock
+        start_at is an optional time.monotonic() deadline to wait for before starting
+        """
+        if start_at:
+            time.sleep(max(0, start_at - time.monotonic()))
+        start_time = time.monotonic()
         resource_id = f"trans_{trans_id}"
 
         conn = None
+        session_key = None
         cursor = None
         lock_acquired = False
 
         try:
-            # Acquire distributed lock BEFORE starting transaction
-            print(f"[{transaction_id}] Attempting to acquire lock on {resource_id} at Node {node_num} at {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
+            # Borrow a pooled connection
+            conn = self.get_connection(node_num)
+            session_key = (node_num, conn.connection_id)
 
-            lock_acquired = self.lock_manager.acquire_lock(resource_id, node_num, timeout=30)
+            # Acquire the resource lock BEFORE starting transaction
+            self._log(transaction_id, f"Attempting to acquire lock on {resource_id} at Node {node_num}", timestamp=True)
+
+            lock_acquired = self.acquire_resource_lock(conn, node_num, resource_id, timeout=30)
 
             if not lock_acquired:
                 raise Exception(f"Failed to acquire lock on {resource_id}")
 
-            print(f"[{transaction_id}] Lock acquired, starting write on Node {node_num} at {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
-
-            # Connect to database with longer timeout for SERIALIZABLE
-            conn_config = config.copy()
-            if isolation_level == 'SERIALIZABLE':
-                # Increase connection timeout for SERIALIZABLE to handle stricter locking
-                conn_config['connection_timeout'] = 60
-
-            conn = mysql.connector.connect(**conn_config)
+            self._log(transaction_id, f"Lock acquired, starting write on Node {node_num}", timestamp=True)
             cursor = conn.cursor(dictionary=True)
 
-            # Set isolation level
-            cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}")
-
-            # For SERIALIZABLE, also set innodb_lock_wait_timeout higher
-            if isolation_level == 'SERIALIZABLE':
-                cursor.execute("SET SESSION innodb_lock_wait_timeout = 50")
-
-            # Validate we still hold the lock before starting transaction
-            if not self.lock_manager.check_lock(resource_id, node_num):
-                raise Exception(f"Lost lock on {resource_id} at Node {node_num}")
-
-            # Start transaction
-            cursor.execute("START TRANSACTION")
-
+            # Set isolation level (if needed), start the transaction, then read and
+            # update the row - all in one round trip so the row lock is held for as
+            # short a time as possible. The new amount is the value just written,
+            # so it is not read back.
             # For SERIALIZABLE: Use FOR UPDATE to explicitly lock the row
-            if isolation_level == 'SERIALIZABLE':
-                cursor.execute("SELECT trans_id, amount FROM trans WHERE trans_id = %s FOR UPDATE", (trans_id,))
-            else:
-                cursor.execute("SELECT trans_id, amount FROM trans WHERE trans_id = %s", (trans_id,))
-
-            before = cursor.fetchone()
-
-            if not before:
+            lock_clause = " FOR UPDATE" if isolation_level == 'SERIALIZABLE' else ""
+            statements = (
+                self.session_setup_sql(session_key, isolation_level) +
+                "START TRANSACTION; "
+                "SET @before_amount = NULL; "
+                f"SELECT amount INTO @before_amount FROM trans WHERE trans_id = %s{lock_clause}; "
+                "UPDATE trans SET amount = %s WHERE trans_id = %s; "
+                "SELECT @before_amount AS before_amount"
+            )
+
+            affected_rows = 0
+            amounts = None
+            for result in cursor.execute(statements, (trans_id, new_amount, trans_id), multi=True):
+                if result.with_rows:
+                    amounts = result.fetchone()
+                elif result.statement.startswith("UPDATE"):
+                    affected_rows = result.rowcount
+            self.session_isolation[session_key] = isolation_level
+
+            if not amounts or amounts['before_amount'] is None:
                 raise Exception(f"Record with trans_id={trans_id} not found on Node {node_num}")
 
-            # Update the amount IMMEDIATELY (locks the row)
-            cursor.execute("UPDATE trans SET amount = %s WHERE trans_id = %s", (new_amount, trans_id))
-
-            # Hold transaction open AFTER update (keeps row locked)
-            # Reduce sleep time for SERIALIZABLE to minimize lock contention
-            sleep_time = 1.5 if isolation_level == 'SERIALIZABLE' else 3
-            time.sleep(sleep_time)
-            affected_rows = cursor.rowcount
-
-            # Read updated value
-            cursor.execute("SELECT trans_id, amount FROM trans WHERE trans_id = %s", (trans_id,))
-            after = cursor.fetchone()
+            # Optionally hold transaction open AFTER update (keeps row locked)
+            if self.simulate_work:
+                time.sleep(self.simulate_work)
 
             # Commit
             conn.commit()
 
-            end_time = time.time()
+            end_time = time.monotonic()
 
-            print(f"[{transaction_id}] Completed write on Node {node_num} at {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
-            print(f"[{transaction_id}] Updated trans_id={trans_id}: {before['amount']} → {after['amount']}")
+            self._log(transaction_id, f"Completed write on Node {node_num}", timestamp=True)
+            self._log(transaction_id, f"Updated trans_id={trans_id}: {amounts['before_amount']} → {new_amount}")
 
             # Store results
-            with self.lock:
-                self.results[transaction_id] = {
-                    'type': 'WRITE',
-                    'node': f'node{node_num}',
-                    'status': 'SUCCESS',
-                    'trans_id': trans_id,
-                    'before_amount': float(before['amount']),
-                    'after_amount': float(after['amount']),
-                    'affected_rows': affected_rows,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'duration': end_time - start_time
-                }
+            self._record_result(transaction_id, {
+                'txn_id': transaction_id,
+                'type': 'WRITE',
+                'node': f'node{node_num}',
+                'status': 'SUCCESS',
+                'trans_id': trans_id,
+                'before_amount': float(amounts['before_amount']),
+                'after_amount': float(new_amount),
+                'affected_rows': affected_rows,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration': end_time - start_time
+            })
 
         except Exception as e:
-            end_time = time.time()
+            end_time = time.monotonic()
             if conn:
                 conn.rollback()
+            if session_key:
+                # The batch may have failed before its SET statements ran
+                self.session_isolation.pop(session_key, None)
 
-            error_str = str(e).lower()
-
-            # Categorize error types
-            if 'lock wait timeout' in error_str or 'deadlock' in error_str:
+            # Categorize error types by MySQL error number
+            if getattr(e, 'errno', None) in LOCK_CONTENTION_ERRNOS:
                 error_category = 'LOCK_CONTENTION'
                 if isolation_level == 'SERIALIZABLE':
-                    print(f"[{transaction_id}] SERIALIZABLE PROTECTION on Node {node_num}: {str(e)}")
+                    self._log(transaction_id, f"SERIALIZABLE PROTECTION on Node {node_num}: {str(e)}")
                 else:
-                    print(f"[{transaction_id}] Lock contention on Node {node_num}: {str(e)}")
-            elif 'failed to acquire lock' in error_str:
+                    self._log(transaction_id, f"Lock contention on Node {node_num}: {str(e)}")
+            elif str(e).startswith("Failed to acquire lock"):
                 error_category = 'DISTRIBUTED_LOCK_TIMEOUT'
-                print(f"[{transaction_id}] Distributed lock timeout on Node {node_num}: {str(e)}")
+                self._log(transaction_id, f"Distributed lock timeout on Node {node_num}: {str(e)}")
+            elif str(e).startswith("Lock queue full"):
+                error_category = 'QUEUE_FULL'
+                self._log(transaction_id, f"Rejected on Node {node_num}: {str(e)}")
             else:
                 error_category = 'OTHER'
-                print(f"[{transaction_id}] ERROR on Node {node_num}: {str(e)}")
-
-            with self.lock:
-                self.results[transaction_id] = {
-                    'type': 'WRITE',
-                    'node': f'node{node_num}',
-                    'status': 'FAILED',
-                    'error': str(e),
-                    'error_category': error_category,
-                    'isolation_level': isolation_level,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'duration': end_time - start_time
-                }
+                self._log(transaction_id, f"ERROR on Node {node_num}: {str(e)}")
+
+            self._record_result(transaction_id, {
+                'txn_id': transaction_id,
+                'type': 'WRITE',
+                'node': f'node{node_num}',
+                'status': 'FAILED',
+                'error': str(e),
+                'error_category': error_category,
+                'isolation_level': isolation_level,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration': end_time - start_time
+            })
 
         finally:
-            # Always release the lock
+            # Always release the lock (pooled sessions are not reset, so it would outlive the transaction)
             if lock_acquired:
-                self.lock_manager.release_lock(resource_id, node_num)
-                print(f"[{transaction_id}] Lock released on {resource_id}")
+                self.release_resource_lock(conn, node_num, resource_id)
+                self._log(transaction_id, f"Lock released on {resource_id}")
 
             if cursor:
                 cursor.close()
             if conn:
                 conn.close()
 
-    def delete_transaction(self, node_num, trans_id, transaction_id, isolation_level):
-        """Execute a delete transaction on specified node with distributed locking"""
-        start_time = time.time()
-        config = self.node_configs[node_num]
+    def delete_transaction(self, node_num, trans_id, transaction_id, isolation_level, start_at=0.0):
+        """
+        Execute a delete transaction on specified node, holding a GET_LOCK row lock
+        start_at is an optional time.monotonic() deadline to wait for before starting
+        """
+        if start_at:
+            time.sleep(max(0, start_at - time.monotonic()))
+        start_time = time.monotonic()
         resource_id = f"trans_{trans_id}"
 
         conn = None
-        cursor = None
+        session_key = None
         lock_acquired = False
 
         try:
-            # Acquire distributed lock BEFORE starting transaction
-            print(f"[{transaction_id}] Attempting to acquire lock on {resource_id} at Node {node_num} at {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
+            # Borrow a pooled connection
+            conn = self.get_connection(node_num)
+            session_key = (node_num, conn.connection_id)
+
+            # Acquire the resource lock BEFORE starting transaction
+            self._log(transaction_id, f"Attempting to acquire lock on {resource_id} at Node {node_num}", timestamp=True)
 
-            lock_acquired = self.lock_manager.acquire_lock(resource_id, node_num, timeout=30)
+            lock_acquired = self.acquire_resource_lock(conn, node_num, resource_id, timeout=30)
 
             if not lock_acquired:
                 raise Exception(f"Failed to acquire lock on {resource_id}")
 
-            print(f"[{transaction_id}] Lock acquired, starting delete on Node {node_num} at {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
-
-            # Connect to database with longer timeout for SERIALIZABLE
-            conn_config = config.copy()
-            if isolation_level == 'SERIALIZABLE':
-                conn_config['connection_timeout'] = 60
-
-            conn = mysql.connector.connect(**conn_config)
-            cursor = conn.cursor(dictionary=True)
-
-            # Set isolation level
-            cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}")
-
-            # For SERIALIZABLE, also set innodb_lock_wait_timeout higher
-            if isolation_level == 'SERIALIZABLE':
-                cursor.execute("SET SESSION innodb_lock_wait_timeout = 50")
+            self._log(transaction_id, f"Lock acquired, starting delete on Node {node_num}", timestamp=True)
 
-            # Validate we still hold the lock before starting transaction
-            if not self.lock_manager.check_lock(resource_id, node_num):
-                raise Exception(f"Lost lock on {resource_id} at Node {node_num}")
-
-            # Start transaction
-            cursor.execute("START TRANSACTION")
+            # Set isolation level (if needed) and start transaction in one round trip
+            setup_cursor = conn.cursor()
+            for _ in setup_cursor.execute(self.session_setup_sql(session_key, isolation_level) + "START TRANSACTION", multi=True):
+                pass
+            setup_cursor.close()
+            self.session_isolation[session_key] = isolation_level
 
             # For SERIALIZABLE: Use FOR UPDATE to explicitly lock the row
             if isolation_level == 'SERIALIZABLE':
-                cursor.execute("SELECT trans_id, amount FROM trans WHERE trans_id = %s FOR UPDATE", (trans_id,))
+                select_sql = "SELECT trans_id, amount FROM trans WHERE trans_id = %s FOR UPDATE"
             else:
-                cursor.execute("SELECT trans_id, amount FROM trans WHERE trans_id = %s", (trans_id,))
+                select_sql = "SELECT trans_id, amount FROM trans WHERE trans_id = %s"
 
-            before = cursor.fetchone()
+            select_cursor = self.get_prepared_cursor(conn, node_num, select_sql)
+            select_cursor.execute(select_sql, (trans_id,))
+            rows = select_cursor.fetchall()
+            before = rows[0] if rows else None
 
             if not before:
                 raise Exception(f"Record with trans_id={trans_id} not found on Node {node_num}")
 
             # Delete the record
-            cursor.execute("DELETE FROM trans WHERE trans_id = %s", (trans_id,))
+            delete_sql = "DELETE FROM trans WHERE trans_id = %s"
+            delete_cursor = self.get_prepared_cursor(conn, node_num, delete_sql)
+            delete_cursor.execute(delete_sql, (trans_id,))
+            affected_rows = delete_cursor.rowcount
 
-            # Hold transaction open AFTER delete
-            # Reduce sleep time for SERIALIZABLE to minimize lock contention
-            sleep_time = 1.5 if isolation_level == 'SERIALIZABLE' else 3
-            time.sleep(sleep_time)
-            affected_rows = cursor.rowcount
+            # Optionally hold transaction open AFTER delete (keeps row locked)
+            if self.simulate_work:
+                time.sleep(self.simulate_work)
 
             # Commit
             conn.commit()
 
-            end_time = time.time()
+            end_time = time.monotonic()
 
-            print(f"[{transaction_id}] Completed delete on Node {node_num} at {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
-            print(f"[{transaction_id}] Deleted trans_id={trans_id} (was: {before['amount']})")
+            self._log(transaction_id, f"Completed delete on Node {node_num}", timestamp=True)
+            self._log(transaction_id, f"Deleted trans_id={trans_id} (was: {before[1]})")
 
             # Store results
-            with self.lock:
-                self.results[transaction_id] = {
-                    'type': 'DELETE',
-                    'node': f'node{node_num}',
-                    'status': 'SUCCESS',
-                    'trans_id': trans_id,
-                    'before_amount': float(before['amount']),
-                    'affected_rows': affected_rows,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'duration': end_time - start_time
-                }
+            self._record_result(transaction_id, {
+                'txn_id': transaction_id,
+                'type': 'DELETE',
+                'node': f'node{node_num}',
+                'status': 'SUCCESS',
+                'trans_id': trans_id,
+                'before_amount': float(before[1]),
+                'affected_rows': affected_rows,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration': end_time - start_time
+            })
 
         except Exception as e:
-            end_time = time.time()
+            end_time = time.monotonic()
             if conn:
                 conn.rollback()
+            if session_key:
+                # The batch may have failed before its SET statements ran
+                self.session_isolation.pop(session_key, None)
 
-            error_str = str(e).lower()
-
-            # Categorize error types
-            if 'lock wait timeout' in error_str or 'deadlock' in error_str:
+            # Categorize error types by MySQL error number
+            if getattr(e, 'errno', None) in LOCK_CONTENTION_ERRNOS:
                 error_category = 'LOCK_CONTENTION'
                 if isolation_level == 'SERIALIZABLE':
-                    print(f"[{transaction_id}] SERIALIZABLE PROTECTION on Node {node_num}: {str(e)}")
+                    self._log(transaction_id, f"SERIALIZABLE PROTECTION on Node {node_num}: {str(e)}")
                 else:
-                    print(f"[{transaction_id}] Lock contention on Node {node_num}: {str(e)}")
-            elif 'failed to acquire lock' in error_str:
+                    self._log(transaction_id, f"Lock contention on Node {node_num}: {str(e)}")
+            elif str(e).startswith("Failed to acquire lock"):
                 error_category = 'DISTRIBUTED_LOCK_TIMEOUT'
-                print(f"[{transaction_id}] Distributed lock timeout on Node {node_num}: {str(e)}")
+                self._log(transaction_id, f"Distributed lock timeout on Node {node_num}: {str(e)}")
+            elif str(e).startswith("Lock queue full"):
+                error_category = 'QUEUE_FULL'
+                self._log(transaction_id, f"Rejected on Node {node_num}: {str(e)}")
             else:
                 error_category = 'OTHER'
-                print(f"[{transaction_id}] ERROR on Node {node_num}: {str(e)}")
-
-            with self.lock:
-                self.results[transaction_id] = {
-                    'type': 'DELETE',
-                    'node': f'node{node_num}',
-                    'status': 'FAILED',
-                    'error': str(e),
-                    'error_category': error_category,
-                    'isolation_level': isolation_level,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'duration': end_time - start_time
-                }
+                self._log(transaction_id, f"ERROR on Node {node_num}: {str(e)}")
+
+            self._record_result(transaction_id, {
+                'txn_id': transaction_id,
+                'type': 'DELETE',
+                'node': f'node{node_num}',
+                'status': 'FAILED',
+                'error': str(e),
+                'error_category': error_category,
+                'isolation_level': isolation_level,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration': end_time - start_time
+            })
 
         finally:
-            # Always release the lock
+            # Always release the lock (pooled sessions are not reset, so it would outlive the transaction)
             if lock_acquired:
-                self.lock_manager.release_lock(resource_id, node_num)
-                print(f"[{transaction_id}] Lock released on {resource_id}")
+                self.release_resource_lock(conn, node_num, resource_id)
+                self._log(transaction_id, f"Lock released on {resource_id}")
 
-            if cursor:
-                cursor.close()
+            # Prepared cursors stay open with the pooled connection for reuse
             if conn:
                 conn.close()
 
@@ -373,113 +602,127 @@ class ConcurrentWriteTest:
 
         print(f"{'='*70}\n")
 
-        self.results = {}  # Reset results
-        threads = []
+        self._reset_results()
+
+        # Each node's copy of the row as it is now, put back exactly after the run
+        original_rows = dict(zip((1, 2, 3), self.executor.map(
+            lambda node_num: self.snapshot_original_row(trans_id, node_num), (1, 2, 3))))
+
+        # (function, transaction_id, args) - args are the handler's leading positional arguments;
+        # transaction_id and isolation_level are passed by keyword
+        tasks = []
 
         if test_scenario == "update_only":
-            # Create 4 writer threads on Node 1
+            # Queue 4 writers on Node 1
             for i in range(1, 5):
-                threads.append(threading.Thread(
-                    target=self.write_transaction,
-                    args=(1, trans_id, 11000.00 + i*1111.11, f"T{i}_WRITER_Node1", isolation_level)
-                ))
+                tasks.append((self.write_transaction, f"T{i}_WRITER_Node1", (1, trans_id, 11000.00 + i*1111.11)))
 
-            # Create 4 writer threads on Node 2
+            # Queue 4 writers on Node 2
             for i in range(5, 9):
-                threads.append(threading.Thread(
-                    target=self.write_transaction,
-                    args=(2, trans_id, 11000.00 + i*1111.11, f"T{i}_WRITER_Node2", isolation_level)
-                ))
+                tasks.append((self.write_transaction, f"T{i}_WRITER_Node2", (2, trans_id, 11000.00 + i*1111.11)))
 
-            # Create 2 writer threads on Node 3
+            # Queue 2 writers on Node 3
             for i in range(9, 11):
-                threads.append(threading.Thread(
-                    target=self.write_transaction,
-                    args=(3, trans_id, 11000.00 + i*1111.11, f"T{i}_WRITER_Node3", isolation_level)
-                ))
+                tasks.append((self.write_transaction, f"T{i}_WRITER_Node3", (3, trans_id, 11000.00 + i*1111.11)))
         else:
             # Mixed scenario with updates and deletes
             # Node 1: 3 updates + 1 delete
             for i in range(1, 4):
-                threads.append(threading.Thread(
-                    target=self.write_transaction,
-                    args=(1, trans_id, 11000.00 + i*1111.11, f"T{i}_UPDATE_Node1", isolation_level)
-                ))
-            threads.append(threading.Thread(
-                target=self.delete_transaction,
-                args=(1, trans_id, f"T4_DELETE_Node1", isolation_level)
-            ))
+                tasks.append((self.write_transaction, f"T{i}_UPDATE_Node1", (1, trans_id, 11000.00 + i*1111.11)))
+            tasks.append((self.delete_transaction, f"T4_DELETE_Node1", (1, trans_id)))
 
             # Node 2: 3 updates + 1 delete
             for i in range(5, 8):
-                threads.append(threading.Thread(
-                    target=self.write_transaction,
-                    args=(2, trans_id, 11000.00 + i*1111.11, f"T{i}_UPDATE_Node2", isolation_level)
-                ))
-            threads.append(threading.Thread(
-                target=self.delete_transaction,
-                args=(2, trans_id, f"T8_DELETE_Node2", isolation_level)
-            ))
+                tasks.append((self.write_transaction, f"T{i}_UPDATE_Node2", (2, trans_id, 11000.00 + i*1111.11)))
+            tasks.append((self.delete_transaction, f"T8_DELETE_Node2", (2, trans_id)))
 
             # Node 3: 2 updates
             for i in range(9, 11):
-                threads.append(threading.Thread(
-                    target=self.write_transaction,
-                    args=(3, trans_id, 11000.00 + i*1111.11, f"T{i}_UPDATE_Node3", isolation_level)
-                ))
+                tasks.append((self.write_transaction, f"T{i}_UPDATE_Node3", (3, trans_id, 11000.00 + i*1111.11)))
+
+        self._assign_result_slots(tasks)
 
         if mode == "concurrent":
-            # Start all threads with slight staggering
-            for i, thread in enumerate(threads):
-                thread.start()
-                time.sleep(0.1)  # Slight stagger to create more realistic conflict scenario
-
-            # Wait for all threads to complete
-            for thread in threads:
-                thread.join()
+            # Submit all transactions at once; each waits for its own start time so they
+            # begin 0.1s apart (slight stagger to create more realistic conflict scenario)
+            t0 = time.monotonic()
+            futures = []
+            for i, (func, txn_id, args) in enumerate(tasks):
+                futures.append(self.executor.submit(
+                    func, *args, transaction_id=txn_id, isolation_level=isolation_level, start_at=t0 + 0.1 * i))
+
+            # Wait for all transactions to complete
+            for future in futures:
+                future.result()
         else:
-            # Sequential execution - run each thread one after another
-            for thread in threads:
-                thread.start()
-                thread.join()  # Wait for this thread to complete before starting next
+            # Sequential execution - run each transaction one after another
+            for func, txn_id, args in tasks:
+                self.executor.submit(func, *args, transaction_id=txn_id, isolation_level=isolation_level).result()  # Wait for this one before starting next
+
+        self._collect_result_slots()
 
         # Display results
         self.display_results()
 
-        # Restore original value on all nodes
-        self.restore_original_value(trans_id, 1)
-        self.restore_original_value(trans_id, 2)
-        self.restore_original_value(trans_id, 3)
+        # Restore original value on all nodes (in parallel - each targets a different node)
+        list(self.executor.map(
+            lambda node_num: self.restore_original_value(trans_id, node_num, original_rows[node_num]), (1, 2, 3)))
 
         return self.results
 
-    def restore_original_value(self, trans_id, node_num):
-        """Restore the original value after test"""
+    def snapshot_original_row(self, trans_id, node_num):
+        """
+        Read a node's copy of the test row before a run
+
+        Returns:
+            dict of column -> value, None if the node does not hold the row,
+            or ROW_UNREADABLE if the node could not be queried
+        """
         try:
-            config = self.node_configs[node_num]
-            conn = mysql.connector.connect(**config)
-            cursor = conn.cursor()
+            conn = self.get_connection(node_num)
+            try:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute("SELECT * FROM trans WHERE trans_id = %s", (trans_id,))
+                row = cursor.fetchone()
+                cursor.close()
+                # End the read snapshot; pooled sessions are not reset on return
+                conn.rollback()
+                return row
+            finally:
+                conn.close()
 
-            # Check if record exists
-            cursor.execute("SELECT COUNT(*) as cnt FROM trans WHERE trans_id = %s", (trans_id,))
-            result = cursor.fetchone()
-
-            if result and result[0] == 0:
-                # Record was deleted, need to restore it
-                # Note: You may need to adjust this based on your table structure
-                cursor.execute(
-                    "INSERT INTO trans (trans_id, amount) VALUES (%s, 1000.00) "
-                    "ON DUPLICATE KEY UPDATE amount = 1000.00",
-                    (trans_id,)
-                )
+        except Exception as e:
+            print(f"\nWarning: Could not read original row on Node {node_num}: {e}")
+            return ROW_UNREADABLE
+
+    def restore_original_value(self, trans_id, node_num, original_row):
+        """
+        Restore the original value after test: put back the row exactly as
+        snapshot_original_row found it. Nodes that did not hold the row are left alone.
+        """
+        if original_row is None or original_row is ROW_UNREADABLE:
+            return
+
+        try:
+            conn = self.get_connection(node_num)
+
+            # Re-insert the full row if it was deleted, otherwise reset every column
+            columns = list(original_row)
+            column_list = ", ".join(f"`{column}`" for column in columns)
+            restore_sql = (
+                f"INSERT INTO trans ({column_list}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                "ON DUPLICATE KEY UPDATE " + ", ".join(f"`{column}` = VALUES(`{column}`)" for column in columns)
+            )
+            cursor = self.get_prepared_cursor(conn, node_num, restore_sql)
+            cursor.execute(restore_sql, tuple(original_row.values()))
+
+            # Affected rows: 1 = inserted, 2 = updated, 0 = already at original value
+            if cursor.rowcount == 1:
                 print(f"\nRestored deleted record trans_id={trans_id} on Node {node_num}")
             else:
-                # Just update the amount
-                cursor.execute("UPDATE trans SET amount = 1000.00 WHERE trans_id = %s", (trans_id,))
                 print(f"\nRestored trans_id={trans_id} to original value on Node {node_num}")
 
             conn.commit()
-            cursor.close()
             conn.close()
 
         except Exception as e:
@@ -491,37 +734,44 @@ class ConcurrentWriteTest:
         print("TEST RESULTS")
         print(f"{'='*70}\n")
 
-        # Create summary table
+        # Create summary table (fixed columns; fields that don't apply are left blank)
         summary = []
         for txn_id, result in sorted(self.results.items()):
-            row = {
-                'Transaction': txn_id,
-                'Type': result['type'],
-                'Node': result['node'],
-                'Status': result['status'],
-                'Duration (s)': f"{result['duration']:.6f}"
-            }
-
+            before_after = ''
+            error = ''
             if result['status'] == 'SUCCESS':
                 if result['type'] == 'WRITE':
-                    row['Before→After'] = f"{result['before_amount']:.2f}→{result['after_amount']:.2f}"
+                    before_after = f"{result['before_amount']:.2f}→{result['after_amount']:.2f}"
                 elif result['type'] == 'DELETE':
-                    row['Before→After'] = f"{result['before_amount']:.2f}→DELETED"
+                    before_after = f"{result['before_amount']:.2f}→DELETED"
             else:
-                row['Error'] = result.get('error', 'Unknown')[:40]
-
-            summary.append(row)
+                error = result.get('error', 'Unknown')[:40]
+
+            summary.append((
+                txn_id,
+                result['type'],
+                result['node'],
+                result['status'],
+                f"{result['duration']:.6f}",
+                before_after,
+                error
+            ))
 
-        df = pd.DataFrame(summary)
-        print(df.to_string(index=False))
+        print_table(summary, SUMMARY_COLUMNS)
 
         # Analyze write conflicts
         print(f"\n{'='*70}")
         print("WRITE CONFLICT ANALYSIS")
         print(f"{'='*70}\n")
 
-        successful_writes = [r for r in self.results.values() if r['status'] == 'SUCCESS']
-        failed_writes = [r for r in self.results.values() if r['status'] == 'FAILED']
+        # Split results by status in one pass
+        successful_writes = []
+        failed_writes = []
+        for r in self.results.values():
+            if r['status'] == 'SUCCESS':
+                successful_writes.append(r)
+            else:
+                failed_writes.append(r)
 
         print(f"Total Transactions: {len(self.results)}")
         print(f"Successful Writes: {len(successful_writes)}")
@@ -531,26 +781,30 @@ class ConcurrentWriteTest:
             # Check for lost updates
             print(f"\nWrite Sequence (by end time):")
             sorted_writes = sorted(successful_writes, key=lambda x: x['end_time'])
+
+            # Flat columns in end-time order, filled in the same pass that prints the sequence
+            before_amounts = array('d')
+            after_amounts = array('d')  # NaN for deletes
+            is_update = array('b')
             for i, write in enumerate(sorted_writes, 1):
-                txn_id = [k for k, v in self.results.items() if v == write][0]
+                txn_id = write['txn_id']
+                before_amounts.append(write['before_amount'])
                 if write['type'] == 'WRITE':
+                    after_amounts.append(write['after_amount'])
+                    is_update.append(1)
                     print(f"  {i}. {txn_id}: {write['before_amount']:.2f} → {write['after_amount']:.2f} on {write['node']}")
                 else:
+                    after_amounts.append(math.nan)
+                    is_update.append(0)
                     print(f"  {i}. {txn_id}: {write['before_amount']:.2f} → DELETED on {write['node']}")
 
-            # Check for potential lost updates
+            # Check for potential lost updates: each update should read what the previous one wrote
             print(f"\nLost Update Detection:")
             for i in range(len(sorted_writes) - 1):
-                current = sorted_writes[i]
-                next_write = sorted_writes[i + 1]
-
-                if current['type'] == 'WRITE' and next_write['type'] == 'WRITE':
-                    if abs(next_write['before_amount'] - current['after_amount']) > 0.01:
-                        current_txn = [k for k, v in self.results.items() if v == current][0]
-                        next_txn = [k for k, v in self.results.items() if v == next_write][0]
-                        print(f"  ⚠ POTENTIAL LOST UPDATE:")
-                        print(f"     {current_txn} wrote {current['after_amount']:.2f}")
-                        print(f"     {next_txn} read {next_write['before_amount']:.2f} (expected {current['after_amount']:.2f})")
+                if is_update[i] and is_update[i + 1] and abs(before_amounts[i + 1] - after_amounts[i]) > 0.01:
+                    print(f"  ⚠ POTENTIAL LOST UPDATE:")
+                    print(f"     {sorted_writes[i]['txn_id']} wrote {after_amounts[i]:.2f}")
+                    print(f"     {sorted_writes[i + 1]['txn_id']} read {before_amounts[i + 1]:.2f} (expected {after_amounts[i]:.2f})")
 
         # Check distributed locking effectiveness
         print(f"\n{'='*70}")
@@ -559,8 +813,14 @@ class ConcurrentWriteTest:
 
         if failed_writes:
             # Count timeout vs other errors
-            timeout_errors = [r for r in failed_writes if 'timeout' in r.get('error', '').lower() or 'lock' in r.get('error', '').lower()]
-            other_errors = [r for r in failed_writes if r not in timeout_errors]
+            timeout_errors = []
+            other_errors = []
+            for r in failed_writes:
+                error_str = r.get('error', '').lower()
+                if 'timeout' in error_str or 'lock' in error_str:
+                    timeout_errors.append(r)
+                else:
+                    other_errors.append(r)
 
             print(f"⚠ {len(failed_writes)} transactions did not complete:")
             print(f"   • {len(timeout_errors)} lock/timeout (EXPECTED with SERIALIZABLE)")
@@ -572,26 +832,20 @@ class ConcurrentWriteTest:
             if other_errors:
                 print(f"\n   Other errors to investigate:")
                 for result in other_errors[:5]:  # Show first 5
-                    txn_id = [k for k, v in self.results.items() if v == result][0]
+                    txn_id = result['txn_id']
                     print(f"      {txn_id}: {result.get('error', 'Unknown error')[:60]}")
         else:
             print(f"✓ All transactions completed successfully")
-            print(f"✓ Distributed lock manager prevented write-write conflicts")
+            print(f"✓ Named row locks prevented write-write conflicts")
 
         # Show timing overlap
         print(f"\n{'='*70}")
         print("CONCURRENCY ANALYSIS")
         print(f"{'='*70}\n")
 
-        start_times = [r['start_time'] for r in self.results.values()]
-        end_times = [r['end_time'] for r in self.results.values()]
-
-        earliest_start = min(start_times)
-        latest_end = max(end_times)
+        earliest_start, latest_end, theoretical_sequential = time_span(self.results)
         total_time = latest_end - earliest_start
 
-        theoretical_sequential = sum(r['duration'] for r in self.results.values())
-
         print(f"Total execution time: {total_time:.6f} seconds")
         print(f"Expected if sequential: {theoretical_sequential:.6f} seconds")
 
@@ -615,13 +869,11 @@ class ConcurrentWriteTest:
         sequential_successful = [v for v in sequential_results.values() if v['status'] == 'SUCCESS']
 
         # Calculate execution times
-        concurrent_start_times = [r['start_time'] for r in concurrent_results.values()]
-        concurrent_end_times = [r['end_time'] for r in concurrent_results.values()]
-        concurrent_duration = max(concurrent_end_times) - min(concurrent_start_times)
+        concurrent_start, concurrent_end, _ = time_span(concurrent_results)
+        concurrent_duration = concurrent_end - concurrent_start
 
-        sequential_start_times = [r['start_time'] for r in sequential_results.values()]
-        sequential_end_times = [r['end_time'] for r in sequential_results.values()]
-        sequential_duration = max(sequential_end_times) - min(sequential_start_times)
+        sequential_start, sequential_end, _ = time_span(sequential_results)
+        sequential_duration = sequential_end - sequential_start
 
         # Compare number of successful transactions
         concurrent_success = len([v for v in concurrent_results.values() if v['status'] == 'SUCCESS'])
@@ -669,26 +921,65 @@ class ConcurrentWriteTest:
         print(f"   Note: {isolation_level} may allow write-write conflicts")
         return True, sequential_duration
 
+    def validate_serializability_from_log(self, concurrent_results, isolation_level):
+        """
+        Validate serializability from the concurrent execution alone, without a second
+        (sequential) run: replayed in commit order, every successful transaction must have
+        read the value the previous committed transaction left behind. Each node holds its
+        own copy of the row and takes its own GET_LOCK, so the chain is checked per node.
+
+        Returns:
+            (is_valid, estimated_sequential_duration) where the estimate is the sum of
+            the transaction durations
+        """
+        print(f"\n{'='*70}")
+        print(f"SERIALIZABILITY VALIDATION (FROM LOG) - {isolation_level}")
+        print(f"{'='*70}\n")
+
+        _, _, estimated_sequential = time_span(concurrent_results)
+
+        committed_by_node = {}
+        for r in sorted(concurrent_results.values(), key=lambda r: r['end_time']):
+            if r['status'] == 'SUCCESS':
+                committed_by_node.setdefault(r['node'], []).append(r)
+
+        violations = []
+        for committed in committed_by_node.values():
+            for previous, current in zip(committed, committed[1:]):
+                # A delete leaves no value, so nothing may commit after it on the same node
+                expected = previous.get('after_amount') if previous['type'] == 'WRITE' else None
+                if expected is None or abs(current['before_amount'] - expected) >= 0.01:
+                    violations.append((previous['txn_id'], current['txn_id']))
+
+        committed_count = sum(len(committed) for committed in committed_by_node.values())
+        print(f"Committed transactions: {committed_count} (serial order = commit order per node)")
+        print(f"Estimated sequential execution: {estimated_sequential:.2f}s")
+
+        if violations:
+            print("\n⚠ WARNING: Commit order is not a valid serial order")
+            for previous_id, current_id in violations:
+                print(f"   {current_id} did not read the value written by {previous_id}")
+            return False, estimated_sequential
+
+        print("\n✓ SERIALIZABLE: Each commit read its predecessor's write")
+        return True, estimated_sequential
+
     def calculate_metrics(self):
         """Calculate performance metrics for comparison"""
-        start_times = [r['start_time'] for r in self.results.values()]
-        end_times = [r['end_time'] for r in self.results.values()]
+        total_time = self._agg_max_end - self._agg_min_start
 
-        earliest_start = min(start_times)
-        latest_end = max(end_times)
-        total_time = latest_end - earliest_start
-
-        successful_txns = sum(1 for r in self.results.values() if r['status'] == 'SUCCESS')
-        failed_txns = sum(1 for r in self.results.values() if r['status'] == 'FAILED')
+        successful_txns = self._agg_success_count
+        failed_txns = self._agg_fail_count
+        rejected_txns = self._agg_rejected_count
 
         # Throughput = successful transactions / total time
         throughput = successful_txns / total_time if total_time > 0 else 0
 
         # Average response time
-        avg_response = sum(r['duration'] for r in self.results.values()) / len(self.results)
+        avg_response = self._agg_sum_duration / len(self.results)
 
-        # Count write conflicts (failed transactions)
-        write_conflicts = failed_txns
+        # Count write conflicts (failed transactions that were not rejected up front)
+        write_conflicts = failed_txns - rejected_txns
 
         return {
             'total_time': total_time,
@@ -697,20 +988,107 @@ class ConcurrentWriteTest:
             'throughput': throughput,
             'avg_response_time': avg_response,
             'success_rate': (successful_txns / len(self.results)) * 100,
-            'write_conflicts': write_conflicts
+            'write_conflicts': write_conflicts,
+            'rejected_txns': rejected_txns
         }
 
-    def cleanup(self):
-        """Cleanup: release all locks"""
-        self.lock_manager.release_all_locks()
-
-def main():
-    """Run all test cases for Case #3"""
-    test = ConcurrentWriteTest()
-
-    # Single scenario - one trans_id that exists on all nodes
-    trans_id = 60
+    def close(self):
+        """Shut down the worker threads"""
+        self.executor.shutdown()
+
+def run_isolation_level(trans_id, isolation_level, simulate_work_s=0.2, full_validation=False, max_queue_depth=None):
+    """
+    Run the concurrent execution for one isolation level and validate it from its
+    log, or against a second, sequential execution when full_validation is set.
+    Builds its own ConcurrentWriteTest (connections and pools can't
+    be shared across processes), so it can run in a worker.
+    max_queue_depth is passed to ConcurrentWriteTest (None: writers always wait).
+    """
+    # Collect this level's output and write it out once at the end, so prints from
+    # the worker threads are memory writes instead of syscalls during the timed
+    # run, and the parallel workers' reports don't interleave
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            # Hold each row lock briefly so concurrent writers actually overlap
+            test = ConcurrentWriteTest(simulate_work_s=simulate_work_s, max_queue_depth=max_queue_depth)
+
+            try:
+                print(f"\n{'='*70}")
+                print(f"Testing with {isolation_level} on trans_id={trans_id}")
+                print(f"{'='*70}")
+
+                # Run concurrent execution
+                print(f"\n[1/{2 if full_validation else 1}] Running CONCURRENT execution...")
+                concurrent_exec = test.run_test(
+                    trans_id=trans_id,
+                    isolation_level=isolation_level,
+                    mode="concurrent",
+                    test_scenario="update_only"
+                )
 
+                # Calculate metrics for this test
+                metrics = test.calculate_metrics()
+
+                if full_validation:
+                    # Run sequential execution for validation
+                    print("\n[2/2] Running SEQUENTIAL execution for validation...")
+                    sequential_exec = test.run_test(
+                        trans_id=trans_id,
+                        isolation_level=isolation_level,
+                        mode="sequential",
+                        test_scenario="update_only"
+                    )
+
+                    # Validate serializability
+                    is_valid, seq_duration = test.validate_serializability(concurrent_exec, sequential_exec, isolation_level)
+                else:
+                    # Validate serializability from the concurrent commit order
+                    sequential_exec = None
+                    is_valid, seq_duration = test.validate_serializability_from_log(concurrent_exec, isolation_level)
+
+                print("\n" + "-"*70)
+            finally:
+                test.close()
+    finally:
+        sys.stdout.write(output.getvalue())
+        sys.stdout.flush()
+
+    return {
+        'isolation_level': isolation_level,
+        'concurrent': concurrent_exec,
+        'sequential': sequential_exec,
+        'metrics': metrics,
+        'is_valid': is_valid,
+        'sequential_duration': seq_duration
+    }
+
+
+def run_isolation_sweep(trans_ids, isolation_levels, full_validation=False, max_queue_depth=None):
+    """
+    Run every isolation level at the same time, one worker process each.
+    Each level gets its own trans_id, so the runs never contend for the same
+    row or named lock and stay independent of each other.
+
+    Returns:
+        list of run_isolation_level() results, in isolation_levels order
+    """
+    with multiprocessing.Pool(len(isolation_levels)) as pool:
+        return pool.starmap(run_isolation_level, [
+            (trans_id, isolation_level, 0.2, full_validation, max_queue_depth)
+            for trans_id, isolation_level in zip(trans_ids, isolation_levels)
+        ])
+
+
+def main(full_validation=False, max_queue_depth=None):
+    """
+    Run all test cases for Case #3
+    full_validation also runs every isolation level sequentially to validate
+    it (--full-validation on the command line); otherwise the concurrent
+    execution's commit log is checked
+    max_queue_depth rejects a writer (QUEUE_FULL, counted as Rejected) when that
+    many writers already wait for the same row lock (--max-queue-depth=N)
+    """
     # Isolation levels to test
     isolation_levels = [
         'READ UNCOMMITTED',
@@ -719,64 +1097,41 @@ def main():
         'SERIALIZABLE'
     ]
 
+    # One trans_id per isolation level so the levels can run in parallel; each run
+    # restores exactly the rows (and amounts) it found on every node
+    trans_ids = [60, 61, 62, 63]
+
     print("\n" + "="*70)
     print("CASE #3: CONCURRENT WRITE TRANSACTIONS TEST")
     print("="*70)
     print("\nTest Configuration:")
-    print(f"  • Trans_ID: {trans_id}")
+    print(f"  • Trans_IDs: {', '.join(f'{t} ({iso})' for t, iso in zip(trans_ids, isolation_levels))}")
     print("  • 10 concurrent WRITE transactions across 3 nodes")
     print("  • Node 1: 4 writers")
     print("  • Node 2: 4 writers")
     print("  • Node 3: 2 writers")
-    print("  • All writers use distributed lock manager")
-    print("  • Testing all 4 isolation levels")
+    print("  • All writers take a GET_LOCK named lock on the row (per node)")
+    if max_queue_depth is not None:
+        print(f"  • Writers are rejected when {max_queue_depth} already wait for the row lock")
+    print("  • Testing all 4 isolation levels (in parallel, one process each)")
     print("  • Focus: Write-Write conflict detection and prevention")
     print("="*70)
 
     # Store metrics for comparison
-    isolation_metrics = {iso: [] for iso in isolation_levels}
+    metric_rows = []  # (isolation_level, metrics) per run
 
     all_results = {}
     sequential_results = {}
     serializability_validation = {}
     sequential_durations = {}
 
-    for isolation_level in isolation_levels:
-        print(f"\n{'='*70}")
-        print(f"Testing with {isolation_level}")
-        print(f"{'='*70}")
-
-        # Run concurrent execution
-        print("\n[1/2] Running CONCURRENT execution...")
-        concurrent_exec = test.run_test(
-            trans_id=trans_id,
-            isolation_level=isolation_level,
-            mode="concurrent",
-            test_scenario="update_only"
-        )
-
-        # Calculate metrics for this test
-        metrics = test.calculate_metrics()
-        isolation_metrics[isolation_level].append(metrics)
-
-        all_results[isolation_level] = concurrent_exec
-
-        # Run sequential execution for validation
-        print("\n[2/2] Running SEQUENTIAL execution for validation...")
-        sequential_exec = test.run_test(
-            trans_id=trans_id,
-            isolation_level=isolation_level,
-            mode="sequential",
-            test_scenario="update_only"
-        )
-        sequential_results[isolation_level] = sequential_exec
-
-        # Validate serializability
-        is_valid, seq_duration = test.validate_serializability(concurrent_exec, sequential_exec, isolation_level)
-        serializability_validation[isolation_level] = is_valid
-        sequential_durations[isolation_level] = seq_duration
-
-        print("\n" + "-"*70)
+    for run in run_isolation_sweep(trans_ids, isolation_levels, full_validation, max_queue_depth):
+        isolation_level = run['isolation_level']
+        metric_rows.append((isolation_level, run['metrics']))
+        all_results[isolation_level] = run['concurrent']
+        sequential_results[isolation_level] = run['sequential']
+        serializability_validation[isolation_level] = run['is_valid']
+        sequential_durations[isolation_level] = run['sequential_duration']
 
     # ========================================================================
     # PERFORMANCE COMPARISON
@@ -789,46 +1144,50 @@ def main():
     # Calculate averages for each isolation level
     comparison_data = []
 
+    aggregated = aggregate_metrics(metric_rows)
+
     for iso_level in isolation_levels:
-        metrics_list = isolation_metrics[iso_level]
-
-        avg_throughput = sum(m['throughput'] for m in metrics_list) / len(metrics_list)
-        avg_response = sum(m['avg_response_time'] for m in metrics_list) / len(metrics_list)
-        avg_success_rate = sum(m['success_rate'] for m in metrics_list) / len(metrics_list)
-        total_failures = sum(m['failed_txns'] for m in metrics_list)
-        total_write_conflicts = sum(m['write_conflicts'] for m in metrics_list)
-
-        comparison_data.append({
-            'Isolation Level': iso_level,
-            'Avg Throughput (txn/s)': f"{avg_throughput:.6f}",
-            'Avg Response Time (s)': f"{avg_response:.6f}",
-            'Success Rate (%)': f"{avg_success_rate:.2f}",
-            'Total Failures': total_failures,
-            'Write Conflicts': total_write_conflicts
-        })
-
-    # Create comparison DataFrame
-    df_comparison = pd.DataFrame(comparison_data)
-    print(df_comparison.to_string(index=False))
+        level = aggregated[iso_level]
+        comparison_data.append((
+            iso_level,
+            f"{level['throughput']:.6f}",
+            f"{level['avg_response_time']:.6f}",
+            f"{level['success_rate']:.2f}",
+            level['failed_txns'],
+            level['write_conflicts'],
+            level['rejected_txns']
+        ))
+
+    # Print comparison table
+    print_table(comparison_data, [
+        'Isolation Level',
+        'Avg Throughput (txn/s)',
+        'Avg Response Time (s)',
+        'Success Rate (%)',
+        'Total Failures',
+        'Write Conflicts',
+        'Rejected'
+    ])
 
     # Display serializability validation summary
     print(f"\n{'='*70}")
-    print("SEQUENTIAL VALIDATION SUMMARY")
+    print("SEQUENTIAL VALIDATION SUMMARY" if full_validation else "SERIALIZABILITY VALIDATION SUMMARY")
     print(f"{'='*70}\n")
 
     for iso_level in isolation_levels:
         status = "✓ PASSED" if serializability_validation.get(iso_level, False) else "⚠ CHECK"
         seq_duration = sequential_durations.get(iso_level, 0)
-        print(f"{status} - {iso_level} (Sequential: {seq_duration:.2f}s)")
+        duration_label = "Sequential" if full_validation else "Estimated sequential"
+        print(f"{status} - {iso_level} ({duration_label}: {seq_duration:.2f}s)")
 
     print(f"\n{'='*70}")
     print("KEY OBSERVATIONS")
     print(f"{'='*70}\n")
-    print("1. Distributed Lock Manager prevents write-write conflicts")
+    print("1. GET_LOCK named row locks prevent write-write conflicts on each node")
     print("2. Transactions serialize on the same data item across nodes")
     print("3. Higher isolation levels may have lower throughput")
     print("4. All successful writes maintain data consistency")
-    print("5. No lost updates due to distributed locking mechanism")
+    print("5. No lost updates due to the row locking mechanism")
 
     print(f"\n{'='*70}")
     print("UNDERSTANDING SERIALIZABLE 'ERRORS'")
@@ -859,12 +1218,16 @@ def main():
     print("Use it when data integrity is more important than throughput.")
     print("For high-concurrency applications, REPEATABLE READ is often sufficient.")
 
-    # Cleanup
-    test.cleanup()
+    # Each transaction released its named lock in its own finally block
     print(f"\n{'='*70}")
     print("✓ Cleanup complete - all locks released")
     print(f"{'='*70}")
 
 if __name__ == "__main__":
-    main()
+    args = sys.argv[1:]
+    max_queue_depth = None
+    for arg in args:
+        if arg.startswith("--max-queue-depth="):
+            max_queue_depth = int(arg.split("=", 1)[1])
+    main(full_validation="--full-validation" in args, max_queue_depth=max_queue_depth)
 
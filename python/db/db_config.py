@@ -8,24 +8,32 @@ Uses st.connection() for better connection management when running in Streamlit.
 Includes distributed locking functionality for coordinating transactions across nodes.
 """
 
-import mysql.connector
 import pandas as pd
 import hashlib
-from datetime import datetime
-from dotenv import load_dotenv
+from cachetools import TTLCache
+import threading
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import os
 from typing import Dict, Any, List
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Cloud SQL connector will be initialized only when needed
 _connector = None
 _streamlit_connections = {}  # Cache for st.connection per node
-
+_connection_pools = {}  # Cache for MySQLConnectionPool per node
+_connection_pools_lock = threading.Lock()
+_read_pools = {}  # Cache for fetch_data's MySQLConnectionPool per node
+_transaction_pools = {}  # Cache for create_dedicated_connection's MySQLConnectionPool per node
+# Runs one query per node at once for fetch_data_all_nodes (threads start on first use)
+_node_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="db_node")
+_dotenv_loaded = False
+
+@functools.lru_cache(maxsize=1)
 def _is_running_in_streamlit():
     """
     Check if code is running inside a Streamlit app.
+    The answer cannot change within a process, so it is computed once.
 
     Returns:
         bool: True if running in Streamlit, False otherwise
@@ -37,29 +45,53 @@ def _is_running_in_streamlit():
         return False
 
 
+def _ensure_env():
+    """
+    Load environment variables from the .env file the first time configuration is read.
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+@functools.lru_cache(maxsize=1)
+def _load_secrets():
+    """
+    Snapshot the top-level Streamlit secrets once per process.
+
+    Returns:
+        dict: Secrets from secrets.toml, or an empty dict if Streamlit or the
+              secrets file is not available
+    """
+    try:
+        import streamlit as st
+        if hasattr(st, 'secrets'):
+            return dict(st.secrets)
+    except (ImportError, FileNotFoundError, KeyError):
+        pass
+    return {}
+
+
+@functools.lru_cache(maxsize=None)
 def _get_config_value(key, default=''):
     """
     Get configuration value from Streamlit secrets or environment variables.
     Streamlit secrets take precedence if available.
+    Each (key, default) pair is looked up once per process and then cached.
 
     Args:
         key (str): Configuration key name
         default: Default value if key not found
 
     Returns:
-        Configuration value
+        Configuration value (booleans from TOML stay Python bools)
     """
-    try:
-        # Try to import streamlit and use secrets
-        import streamlit as st
-        if hasattr(st, 'secrets') and key in st.secrets:
-            value = st.secrets[key]
-            # Handle boolean values from TOML (they come as Python bool, not string)
-            if isinstance(value, bool):
-                return value
-            return value
-    except (ImportError, FileNotFoundError, KeyError):
-        pass
+    _ensure_env()
+    secrets = _load_secrets()
+    if key in secrets:
+        return secrets[key]
 
     # Fall back to environment variables
     return os.getenv(key, default)
@@ -72,7 +104,43 @@ if isinstance(_cache_enabled_value, bool):
 else:
     CACHE_ENABLED = str(_cache_enabled_value).lower() == 'true'
 CACHE_TTL_SECONDS = int(_get_config_value('CACHE_TTL_SECONDS', '3600'))
-_query_cache = {}  # In-memory cache storage per node
+CACHE_MAX_ENTRIES = int(_get_config_value('CACHE_MAX_ENTRIES', '512'))
+# In-memory cache of query results, one per node so nodes never evict each
+# other's entries; expired and least-recently-used entries are evicted, so
+# memory stays bounded (CACHE_MAX_ENTRIES per node)
+_query_caches = {node: TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS) for node in (1, 2, 3)}
+# Errors from recently failed queries, so an identical retry within a few seconds
+# re-raises without reconnecting; kept short so transient failures clear quickly
+FAILED_QUERY_TTL_SECONDS = 5
+_failed_query_caches = {node: TTLCache(maxsize=128, ttl=FAILED_QUERY_TTL_SECONDS) for node in (1, 2, 3)}
+# TTLCache is not thread-safe, so every cache read and write holds this lock.
+# _inflight_fetches maps (node, cache_key) to an Event for queries being fetched
+# right now, so concurrent misses on the same query wait for one database trip
+_query_cache_lock = threading.Lock()
+_inflight_fetches = {}
+INFLIGHT_WAIT_SECONDS = 30
+
+# Fetch manual (non-Streamlit) query results through Arrow in row chunks instead of
+# one fetchall(), so only one chunk of Python row tuples is alive at a time
+_arrow_fetch_value = _get_config_value('USE_ARROW_FETCH', 'False')
+if isinstance(_arrow_fetch_value, bool):
+    USE_ARROW_FETCH = _arrow_fetch_value
+else:
+    USE_ARROW_FETCH = str(_arrow_fetch_value).lower() == 'true'
+ARROW_FETCH_CHUNK_ROWS = 50_000
+# Results with at least this many rows are cached as Arrow IPC bytes instead of a
+# DataFrame - far smaller than pandas object columns for string data
+ARROW_CACHE_MIN_ROWS = 1000
+
+# Connections kept open per node by the connection pool
+POOL_SIZE = int(_get_config_value('DB_POOL_SIZE', '8'))
+# Connections kept open per node for GUI write transactions, which may stay checked out
+# across reruns while a transaction is pending; separate from the shared pool so they
+# cannot starve it
+TRANSACTION_POOL_SIZE = int(_get_config_value('DB_TRANSACTION_POOL_SIZE', '4'))
+# Prepared cursors kept per read-pool session; the least recently used one is
+# closed (and its server-side statement deallocated) when the limit is reached
+READ_PREPARED_CURSORS_PER_CONNECTION = 32
 
 # Node Selection Configuration
 # For Streamlit deployment: Use NODE_USE from secrets.toml (must be set manually: 1, 2, or 3)
@@ -176,44 +244,51 @@ STREAMLIT_CONN_NAMES = {
     3: {"cloud": "mysql_node3", "local": "mysql_local_node3"}
 }
 
+# USE_CLOUD_SQL is fixed at import, so resolve each node's active config and
+# Streamlit connection name once instead of on every call
+_CONFIG_TYPE = "cloud" if USE_CLOUD_SQL else "local"
+_CONFIG_TYPE_LABEL = "Cloud SQL" if USE_CLOUD_SQL else "Local"
+_ACTIVE_CONFIGS = {node: configs[_CONFIG_TYPE] for node, configs in NODE_CONFIGS.items()}
+_ACTIVE_CONN_NAMES = {node: names[_CONFIG_TYPE] for node, names in STREAMLIT_CONN_NAMES.items()}
+
 
-def _generate_cache_key(query, node):
+@functools.lru_cache(maxsize=1024)
+def _normalize_query(query):
     """
-    Generate a unique cache key for a query and node combination.
+    Collapse whitespace and lowercase a query for use in a cache key.
+    Callers pass the same query strings over and over, so results are memoized.
 
     Args:
         query (str): SQL query string
-        node (int): Node number (1, 2, or 3)
 
     Returns:
-        str: MD5 hash of the query and node
+        str: Normalized query
     """
-    # Normalize query: strip whitespace and convert to lowercase
-    normalized_query = ' '.join(query.strip().lower().split())
-    # Include node number in cache key
-    cache_input = f"node{node}:{normalized_query}"
-    return hashlib.md5(cache_input.encode()).hexdigest()
+    return ' '.join(query.strip().lower().split())
 
 
-def _is_cache_valid(cache_entry):
+def _generate_cache_key(query, params=None):
     """
-    Check if a cache entry is still valid based on TTL.
+    Generate a cache key for a query. The node is implied by which
+    node's cache the key is used with.
 
     Args:
-        cache_entry (dict): Cache entry with 'timestamp' and 'data' keys
+        query (str): SQL query string
+        params (tuple): Bound parameter values, if any
 
     Returns:
-        bool: True if cache is valid, False if expired
+        str: 128-bit BLAKE2b hash of the query and parameters
     """
-    if not CACHE_ENABLED:
-        return False
-
-    timestamp = cache_entry.get('timestamp')
-    if not timestamp:
-        return False
-
-    age = (datetime.now() - timestamp).total_seconds()
-    return age < CACHE_TTL_SECONDS
+    # Normalize query: strip whitespace and convert to lowercase. Short queries
+    # are keyed as written - a differently formatted copy only costs a cache miss
+    if len(query) < 128:
+        normalized_query = query
+    else:
+        normalized_query = _normalize_query(query)
+    cache_input = normalized_query
+    if params:
+        cache_input += f":{tuple(params)!r}"
+    return hashlib.blake2b(cache_input.encode(), digest_size=16).hexdigest()
 
 
 def get_node_config(node):
@@ -229,16 +304,73 @@ def get_node_config(node):
     Raises:
         ValueError: If node number is invalid
     """
-    if node not in NODE_CONFIGS:
+    try:
+        return _ACTIVE_CONFIGS[node]
+    except KeyError:
         raise ValueError(f"Invalid node number: {node}. Must be 1, 2, or 3.")
 
-    config_type = "cloud" if USE_CLOUD_SQL else "local"
-    return NODE_CONFIGS[node][config_type]
 
+# Error message templates, filled in by _DBError only when the message is shown
+_CONNECT_DB_ERROR = (
+    "Failed to connect to {config_type} database (Node {node})\n"
+    "Host: {config[host]}:{config[port]}\n"
+    "Database: {config[database]}\n"
+    "User: {config[user]}\n"
+    "Error Code: {error_code}\n"
+    "Error: {error}\n\n"
+    "Common solutions:\n"
+    "1. Check if the database server is running\n"
+    "2. Verify host/port are correct\n"
+    "3. Ensure user has proper permissions\n"
+    "4. Check firewall/network settings\n"
+    "5. For Cloud SQL: verify IP whitelist and public IP access"
+)
+_CONNECT_ERROR = (
+    "Failed to connect to {config_type} database (Node {node}) at {config[host]}:{config[port]}\n"
+    "Error: {error}"
+)
+_FETCH_DB_ERROR = (
+    "Database error while fetching data from {config_type} (Node {node}) "
+    "({config[host]}:{config[port]}/{config[database]}): {error}\n"
+    "Query: {query:.200}..."
+)
+_FETCH_ERROR = (
+    "Failed to fetch data from {config_type} (Node {node}) "
+    "({config[host]}:{config[port]}/{config[database]}): {error}\n"
+    "Error type: {error.__class__.__name__}"
+)
+
+
+class _DBError(Exception):
+    """
+    Database error that formats its message on demand.
+    Only the template and its fields are stored when the error is raised;
+    the message is built the first time str() is called on it.
+    """
 
-def get_db_connection(node):
+    def __init__(self, template, node, error, **fields):
+        super().__init__(template)
+        self.template = template
+        self.node = node
+        self.error = error
+        self.fields = fields
+        self._message = None
+
+    def __str__(self):
+        if self._message is None:
+            self._message = self.template.format(
+                node=self.node,
+                error=self.error,
+                config=_ACTIVE_CONFIGS[self.node],
+                config_type=_CONFIG_TYPE_LABEL,
+                **self.fields
+            )
+        return self._message
+
+
+def _open_connection(node):
     """
-    Establish and return a database connection for a specific node.
+    Open a new (unpooled) database connection for a specific node.
 
     Args:
         node (int): Node number (1, 2, or 3)
@@ -249,8 +381,9 @@ def get_db_connection(node):
     Raises:
         Exception: If connection fails
     """
+    import mysql.connector
+
     config = get_node_config(node)
-    config_type = "Cloud SQL" if USE_CLOUD_SQL else "Local"
 
     try:
         conn = mysql.connector.connect(
@@ -265,43 +398,318 @@ def get_db_connection(node):
         return conn
     except mysql.connector.Error as db_err:
         error_code = db_err.errno if hasattr(db_err, 'errno') else 'Unknown'
-        error_msg = (
-            f"Failed to connect to {config_type} database (Node {node})\n"
-            f"Host: {config['host']}:{config['port']}\n"
-            f"Database: {config['database']}\n"
-            f"User: {config['user']}\n"
-            f"Error Code: {error_code}\n"
-            f"Error: {str(db_err)}\n\n"
-            f"Common solutions:\n"
-            f"1. Check if the database server is running\n"
-            f"2. Verify host/port are correct\n"
-            f"3. Ensure user has proper permissions\n"
-            f"4. Check firewall/network settings\n"
-            f"5. For Cloud SQL: verify IP whitelist and public IP access"
-        )
-        raise Exception(error_msg)
+        raise _DBError(_CONNECT_DB_ERROR, node, db_err, error_code=error_code)
     except Exception as e:
-        raise Exception(f"Failed to connect to {config_type} database (Node {node}) at {config['host']}:{config['port']}\n"
-                      f"Error: {str(e)}")
+        raise _DBError(_CONNECT_ERROR, node, e)
+
+
+def _get_connection_pool(node):
+    """
+    Return the connection pool for a node, creating it on first use.
+
+    Args:
+        node (int): Node number (1, 2, or 3)
+
+    Returns:
+        pooling.MySQLConnectionPool: Pool of open connections to the node
+    """
+    from mysql.connector import pooling
+
+    with _connection_pools_lock:
+        if node not in _connection_pools:
+            config = get_node_config(node)
+            _connection_pools[node] = pooling.MySQLConnectionPool(
+                pool_name=f"node{node}",
+                pool_size=POOL_SIZE,
+                host=config["host"],
+                port=config["port"],
+                user=config["user"],
+                password=config["password"],
+                database=config["database"],
+                autocommit=False,
+                connect_timeout=10
+            )
+        return _connection_pools[node]
+
+
+def _get_read_pool(node):
+    """
+    Return fetch_data's connection pool for a node, creating it on first use.
+    Sessions are not reset on return, so statements prepared on a connection stay
+    prepared; autocommit keeps each SELECT from reading an old snapshot.
+
+    Args:
+        node (int): Node number (1, 2, or 3)
+
+    Returns:
+        pooling.MySQLConnectionPool: Pool of open connections to the node
+    """
+    from mysql.connector import pooling
+
+    with _connection_pools_lock:
+        if node not in _read_pools:
+            config = get_node_config(node)
+            _read_pools[node] = pooling.MySQLConnectionPool(
+                pool_name=f"read_node{node}",
+                pool_size=POOL_SIZE,
+                pool_reset_session=False,
+                host=config["host"],
+                port=config["port"],
+                user=config["user"],
+                password=config["password"],
+                database=config["database"],
+                autocommit=True,
+                connect_timeout=10
+            )
+        return _read_pools[node]
+
+
+def _get_transaction_pool(node):
+    """
+    Return create_dedicated_connection's connection pool for a node, creating it on first use.
+    Sessions are reset on return, so a pending transaction never leaks into the next borrower.
+
+    Args:
+        node (int): Node number (1, 2, or 3)
+
+    Returns:
+        pooling.MySQLConnectionPool: Pool of open connections to the node
+    """
+    from mysql.connector import pooling
+
+    with _connection_pools_lock:
+        if node not in _transaction_pools:
+            config = get_node_config(node)
+            _transaction_pools[node] = pooling.MySQLConnectionPool(
+                pool_name=f"txn_node{node}",
+                pool_size=TRANSACTION_POOL_SIZE,
+                pool_reset_session=True,
+                host=config["host"],
+                port=config["port"],
+                user=config["user"],
+                password=config["password"],
+                database=config["database"],
+                autocommit=False,
+                connect_timeout=10
+            )
+        return _transaction_pools[node]
+
+
+def _read_cursor_cache(conn):
+    """
+    Return the prepared-cursor cache of a read-pool connection.
+    The cache lives on the underlying connection (the pool hands out a new wrapper on
+    every checkout), so it goes away with the connection. When the pool has
+    reconnected the session, the server already dropped its prepared statements and
+    the old cache is discarded without closing them.
+
+    Args:
+        conn: Connection borrowed from _get_read_pool
+
+    Returns:
+        OrderedDict: Query -> prepared cursor, least recently used first
+    """
+    cnx = getattr(conn, '_cnx', conn)
+    cache = getattr(cnx, '_read_prepared_cursors', None)
+    if cache is None or cache[0] != cnx.connection_id:
+        cache = (cnx.connection_id, OrderedDict())
+        cnx._read_prepared_cursors = cache
+    return cache[1]
+
+
+def _get_read_cursor(conn, query):
+    """
+    Return a prepared cursor for a parameterized query on a read-pool connection.
+    The cursor is kept and reused, so the server parses the statement once per
+    session and later calls only bind and execute. At most
+    READ_PREPARED_CURSORS_PER_CONNECTION cursors are kept per session.
+
+    Args:
+        conn: Connection borrowed from _get_read_pool
+        query (str): SQL query the cursor will execute
+
+    Returns:
+        Prepared cursor; do not close it, use _discard_read_cursor instead
+    """
+    cursors = _read_cursor_cache(conn)
+    cursor = cursors.get(query)
+    if cursor is not None:
+        cursors.move_to_end(query)
+        return cursor
+
+    cursor = conn.cursor(prepared=True)
+    cursors[query] = cursor
+    if len(cursors) > READ_PREPARED_CURSORS_PER_CONNECTION:
+        _, evicted = cursors.popitem(last=False)
+        evicted.close()
+    return cursor
+
+
+def _discard_read_cursor(conn, query):
+    """
+    Remove a query's prepared cursor from a read-pool connection's cache and close it.
+
+    Args:
+        conn: Connection borrowed from _get_read_pool
+        query (str): SQL query the cursor was prepared for
+    """
+    cursor = _read_cursor_cache(conn).pop(query, None)
+    if cursor is not None:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+def get_db_connection(node):
+    """
+    Return a database connection for a specific node, borrowed from its connection pool.
+    Calling close() on the returned connection hands it back to the pool
+    instead of closing the socket, so callers skip the TCP and auth handshake.
+    The session (isolation level, open transaction) is reset on return.
+
+    Args:
+        node (int): Node number (1, 2, or 3)
+
+    Returns:
+        mysql.connector.connection: Database connection object
+
+    Raises:
+        Exception: If connection fails
+    """
+    from mysql.connector import pooling
+    import mysql.connector
+
+    try:
+        pool = _get_connection_pool(node)
+    except mysql.connector.Error as db_err:
+        # Node unreachable - report it once instead of retrying with a one-off connect
+        error_code = db_err.errno if hasattr(db_err, 'errno') else 'Unknown'
+        raise _DBError(_CONNECT_DB_ERROR, node, db_err, error_code=error_code)
+
+    try:
+        return pool.get_connection()
+    except pooling.PoolError:
+        # Every pooled connection is checked out - open a one-off connection instead
+        return _open_connection(node)
+
+
+def _to_named_params(query, params):
+    """
+    Rewrite %s placeholders as :p0, :p1, ... for SQLAlchemy's text() binding.
+
+    Args:
+        query (str): SQL query using %s placeholders
+        params (tuple): Values for the placeholders, in order
+
+    Returns:
+        tuple: (rewritten query, dict of named parameters)
+    """
+    parts = query.split("%s")
+    if len(parts) - 1 != len(params):
+        raise ValueError(f"Query has {len(parts) - 1} placeholders but {len(params)} parameters were given")
+    named_query = parts[0]
+    for i, part in enumerate(parts[1:]):
+        named_query += f":p{i}" + part
+    return named_query, {f"p{i}": value for i, value in enumerate(params)}
+
+
+def _fetch_arrow_frame(cursor, columns):
+    """
+    Read an executed cursor's rows in chunks of ARROW_FETCH_CHUNK_ROWS into Arrow
+    columns and convert the result to a DataFrame once at the end.
+
+    Args:
+        cursor: Cursor with an executed SELECT
+        columns (list): Column names from cursor.description
+
+    Returns:
+        pandas.DataFrame: Query results
+    """
+    import pyarrow as pa
+
+    tables = []
+    while True:
+        rows = cursor.fetchmany(ARROW_FETCH_CHUNK_ROWS)
+        if not rows:
+            break
+        # Transpose row tuples into one array per column
+        tables.append(pa.table([pa.array(values) for values in zip(*rows)], names=columns))
+
+    if not tables:
+        return pd.DataFrame(columns=columns)
+    # A chunk where a column was all NULL has a null-typed column; promote to the common type
+    return pa.concat_tables(tables, promote_options="default").to_pandas()
+
+
+def _pack_cache_entry(df):
+    """
+    Convert a query result into the form stored in the query cache.
+
+    Args:
+        df (pandas.DataFrame): Query results
+
+    Returns:
+        DataFrame for small results, or a pyarrow.Buffer holding the frame as an
+        Arrow IPC stream for results of ARROW_CACHE_MIN_ROWS rows or more
+    """
+    if len(df) < ARROW_CACHE_MIN_ROWS:
+        return df
+
+    import pyarrow as pa
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Mixed-type object column Arrow can't represent - keep the DataFrame
+        return df
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
 
+def _unpack_cache_entry(entry):
+    """
+    Turn a query cache entry back into a DataFrame the caller may modify.
+
+    Args:
+        entry: Value stored by _pack_cache_entry
 
-def fetch_data(query, node, ttl=9999):
+    Returns:
+        pandas.DataFrame: Query results
+    """
+    if isinstance(entry, pd.DataFrame):
+        # Shallow copy: a new frame over the cached columns, no data is copied
+        return entry.copy(deep=False)
+
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(entry).read_all().to_pandas()
+
+
+def fetch_data(query, node, ttl=9999, params=None):
     """
     Execute a SQL query and return results as a pandas DataFrame from a specific node.
     Uses st.connection() when running in Streamlit for better caching and connection management.
     Falls back to direct MySQL connection when not in Streamlit.
 
     Args:
-        query (str): SQL query to execute
+        query (str): SQL query to execute, with %s placeholders for params
         node (int): Node number (1, 2, or 3) to query from
         ttl (int): Time-to-live for cached results in seconds (default: 9999)
+        params (tuple): Values bound to the %s placeholders (default: None)
 
     Returns:
-        pandas.DataFrame: Query results
+        pandas.DataFrame: Query results. Outside Streamlit, results under
+        ARROW_CACHE_MIN_ROWS rows share their data with the query cache: adding or
+        replacing columns is safe, but copy() it before editing values in place.
 
     Raises:
         Exception: If query execution fails
     """
+    import mysql.connector
+
     # Validate node number
     if node not in NODE_CONFIGS:
         raise ValueError(f"Invalid node number: {node}. Must be 1, 2, or 3.")
@@ -312,16 +720,18 @@ def fetch_data(query, node, ttl=9999):
         try:
             import streamlit as st
             # Get the appropriate connection name for this node
-            config_type = "cloud" if USE_CLOUD_SQL else "local"
-            conn_name = STREAMLIT_CONN_NAMES[node][config_type]
+            conn_name = _ACTIVE_CONN_NAMES[node]
 
             # Use st.connection for automatic caching and connection management
             conn = st.connection(conn_name, type='sql')
             # Execute query with built-in caching (ttl in seconds)
+            if params:
+                named_query, named_params = _to_named_params(query, params)
+                return conn.query(named_query, ttl=ttl, params=named_params)
             return conn.query(query, ttl=ttl)
         except Exception as e:
-            config = get_node_config(node)
-            config_type_name = "Cloud SQL" if USE_CLOUD_SQL else "Local"
+            config = _ACTIVE_CONFIGS[node]
+            config_type_name = _CONFIG_TYPE_LABEL
             conn_name_msg = f"[connections.{conn_name}]" if conn_name else "connection"
             error_msg = (
                 f"Streamlit connection failed for {config_type_name} (Node {node}) "
@@ -333,57 +743,245 @@ def fetch_data(query, node, ttl=9999):
             raise Exception(error_msg)
 
     # Not in Streamlit - use manual connection with custom caching
-    cache_key = _generate_cache_key(query, node)
-
-    # Check if valid cached result
-    if CACHE_ENABLED and cache_key in _query_cache:
-        cache_entry = _query_cache[cache_key]
-        if _is_cache_valid(cache_entry):
-            return cache_entry['data'].copy()
-        else:
-            del _query_cache[cache_key]
+    cache_key = _generate_cache_key(query, params)
+    query_cache = _query_caches[node]
+    failed_query_cache = _failed_query_caches[node]
+
+    inflight_key = (node, cache_key)
+    fetch_done = None
+    cached = None
+
+    # Check if valid cached result (TTLCache drops expired entries itself)
+    while CACHE_ENABLED:
+        with _query_cache_lock:
+            cached = query_cache.get(cache_key)
+            if cached is not None:
+                break
+            failed = failed_query_cache.get(cache_key)
+            if failed is not None:
+                # Same query failed moments ago - don't pay for the round-trip again
+                raise failed
+            waiting_on = _inflight_fetches.get(inflight_key)
+            if waiting_on is None:
+                # This thread fetches; identical requests arriving now wait on it
+                fetch_done = _inflight_fetches[inflight_key] = threading.Event()
+                break
+        # Another thread is already running this query - wait for it, then re-check
+        # the caches. If it takes too long, stop waiting and query directly
+        if not waiting_on.wait(timeout=INFLIGHT_WAIT_SECONDS):
+            break
+
+    if cached is not None:
+        # Rebuilt outside the lock - unpacking a large Arrow entry takes a moment
+        return _unpack_cache_entry(cached)
 
     # Cache miss or expired - fetch from database
+    from mysql.connector import pooling
+
     conn = None
     cursor = None
+    cached_cursor = False
 
     try:
-        conn = get_db_connection(node)
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        data = cursor.fetchall()
-        result_df = pd.DataFrame(data)
+        try:
+            conn = _get_read_pool(node).get_connection()
+            read_session = True
+        except pooling.PoolError:
+            # Every read-pool session is checked out - borrow from the shared pool.
+            # Connection errors are not retried here; they propagate as before
+            conn = get_db_connection(node)
+            read_session = False
+        if params and read_session:
+            # Prepared cursors bind values server-side; on read-pool sessions the
+            # statement stays prepared for the next call with the same query
+            cursor = _get_read_cursor(conn, query)
+            cached_cursor = True
+            cursor.execute(query, tuple(params))
+        elif params:
+            cursor = conn.cursor(prepared=True)
+            cursor.execute(query, tuple(params))
+        else:
+            cursor = conn.cursor()
+            cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+        if USE_ARROW_FETCH:
+            result_df = _fetch_arrow_frame(cursor, columns)
+        else:
+            # Build the frame from row tuples plus the column names, no per-row dicts
+            result_df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
 
         # Store in cache
         if CACHE_ENABLED:
-            _query_cache[cache_key] = {
-                'timestamp': datetime.now(),
-                'data': result_df.copy(),
-                'query': query[:100],
-                'node': node
-            }
+            entry = _pack_cache_entry(result_df)
+            with _query_cache_lock:
+                query_cache[cache_key] = entry
+            if entry is result_df:
+                return result_df.copy(deep=False)
 
         return result_df
 
     except mysql.connector.Error as db_err:
-        config = get_node_config(node)
-        config_type = "Cloud SQL" if USE_CLOUD_SQL else "Local"
-        error_msg = (
-            f"Database error while fetching data from {config_type} (Node {node}) "
-            f"({config['host']}:{config['port']}/{config['database']}): {str(db_err)}\n"
-            f"Query: {query[:200]}..."
-        )
-        raise Exception(error_msg)
+        if cached_cursor:
+            # Don't reuse a cursor that may still hold unread rows
+            _discard_read_cursor(conn, query)
+            cursor = None
+        error = _DBError(_FETCH_DB_ERROR, node, db_err, query=query)
+        if CACHE_ENABLED:
+            with _query_cache_lock:
+                failed_query_cache[cache_key] = error
+        raise error
 
     except Exception as e:
-        config = get_node_config(node)
-        config_type = "Cloud SQL" if USE_CLOUD_SQL else "Local"
-        error_msg = (
-            f"Failed to fetch data from {config_type} (Node {node}) "
-            f"({config['host']}:{config['port']}/{config['database']}): {str(e)}\n"
-            f"Error type: {type(e).__name__}"
+        if cached_cursor:
+            _discard_read_cursor(conn, query)
+            cursor = None
+        error = _DBError(_FETCH_ERROR, node, e)
+        if CACHE_ENABLED:
+            with _query_cache_lock:
+                failed_query_cache[cache_key] = error
+        raise error
+
+    finally:
+        if cursor and not cached_cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+        if fetch_done:
+            with _query_cache_lock:
+                del _inflight_fetches[inflight_key]
+            fetch_done.set()
+
+def fetch_data_all_nodes(query, nodes=(1, 2, 3), ttl=9999, params=None):
+    """
+    Run the same query on several nodes concurrently with fetch_data.
+    Total wait is the slowest node's query instead of the sum of all of them.
+
+    Args:
+        query (str): SQL query to execute, with %s placeholders for params
+        nodes (iterable): Node numbers to query (default: all three)
+        ttl (int): Time-to-live for cached results in seconds (default: 9999)
+        params (tuple): Values bound to the %s placeholders (default: None)
+
+    Returns:
+        dict: Node number -> DataFrame, or the Exception fetch_data raised for that node
+    """
+    run = fetch_data
+    if _is_running_in_streamlit():
+        # Worker threads need the script's context to use st.connection
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+        ctx = get_script_run_ctx()
+
+        def run(*args):
+            add_script_run_ctx(ctx=ctx)
+            return fetch_data(*args)
+
+    futures = {node: _node_executor.submit(run, query, node, ttl, params) for node in nodes}
+    results = {}
+    for node, future in futures.items():
+        try:
+            results[node] = future.result()
+        except Exception as e:
+            results[node] = e
+    return results
+
+
+def fetch_batches(query, node, size=500, params=None):
+    """
+    Execute a SQL query on a specific node and yield the results in batches.
+    Rows are read with cursor.fetchmany() so callers can render the first batch
+    before the rest of the result set has arrived. Always queries the database
+    directly (no caching).
+
+    Args:
+        query (str): SQL query to execute, with %s placeholders for params
+        node (int): Node number (1, 2, or 3) to query from
+        size (int): Maximum number of rows per batch (default: 500)
+        params (tuple): Values bound to the %s placeholders (default: None)
+
+    Yields:
+        pyarrow.RecordBatch: Next batch of rows
+
+    Raises:
+        Exception: If query execution fails
+    """
+    import mysql.connector
+    import pyarrow as pa
+
+    # Validate node number
+    if node not in NODE_CONFIGS:
+        raise ValueError(f"Invalid node number: {node}. Must be 1, 2, or 3.")
+
+    conn = None
+    cursor = None
+
+    try:
+        conn = get_db_connection(node)
+        if params:
+            cursor = conn.cursor(prepared=True)
+            cursor.execute(query, tuple(params))
+        else:
+            cursor = conn.cursor()
+            cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+
+        while True:
+            rows = cursor.fetchmany(size)
+            if not rows:
+                break
+            # Transpose row tuples into one array per column
+            arrays = [pa.array(values) for values in zip(*rows)]
+            yield pa.RecordBatch.from_arrays(arrays, names=columns)
+
+    except mysql.connector.Error as db_err:
+        raise _DBError(_FETCH_DB_ERROR, node, db_err, query=query)
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+def get_table_version(node, table="trans"):
+    """
+    Return a table's last modification time on a node, for use as a cache version.
+    Reads UPDATE_TIME from information_schema with the statistics cache disabled
+    (MySQL 8 otherwise serves it from a copy refreshed once a day).
+
+    UPDATE_TIME only has one-second resolution, so a table changed within the
+    last two seconds is reported as unknown: another write in the same second
+    would not move the version, and a result cached under it could go stale.
+
+    Args:
+        node (int): Node number (1, 2, or 3)
+        table (str): Table name in the node's database (default: trans)
+
+    Returns:
+        int: Unix timestamp of the last committed change, or None if unknown
+             (recently changed, or InnoDB cleared it on server restart)
+    """
+    import mysql.connector
+
+    conn = None
+    cursor = None
+
+    try:
+        conn = get_db_connection(node)
+        cursor = conn.cursor()
+        cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+        cursor.execute(
+            "SELECT UNIX_TIMESTAMP(UPDATE_TIME), UNIX_TIMESTAMP() FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s",
+            (table,)
         )
-        raise Exception(error_msg)
+        row = cursor.fetchone()
+        if not row or row[0] is None:
+            return None
+
+        version, server_now = int(row[0]), int(row[1])
+        return version if server_now - version >= 2 else None
+
+    except mysql.connector.Error as db_err:
+        raise Exception(f"MySQL Error for Node {node}: {str(db_err)}")
 
     finally:
         if cursor:
@@ -403,19 +1001,18 @@ def execute_query(query, node, isolation_level="READ COMMITTED"):
     Returns:
         Number of affected rows or True on success
     """
+    import mysql.connector
+
     # Validate node number
     if node not in NODE_CONFIGS:
         raise ValueError(f"Invalid node number: {node}. Must be 1, 2, or 3.")
-    
-    # Get config from centralized node config
-    config = get_node_config(node)
 
     conn = None
     cursor = None
     
     try:
-        # Connect to MySQL
-        conn = mysql.connector.connect(**config)
+        # Borrow a pooled connection (session is reset when it is returned)
+        conn = get_db_connection(node)
         cursor = conn.cursor()
         
         # Set isolation level
@@ -463,11 +1060,11 @@ def test_connection(node):
     """
     try:
         conn = get_db_connection(node)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        cursor.fetchone()
-        cursor.close()
-        conn.close()
+        try:
+            # COM_PING on the pooled socket - no query to parse, no result set
+            conn.ping(reconnect=True, attempts=1, delay=0)
+        finally:
+            conn.close()
         print(f"Node {node} database connection successful!")
         return True
     except Exception as e:
@@ -482,10 +1079,11 @@ def test_connection(node):
 # Initialize the distributed lock manager with node configurations
 _lock_manager = None
 
-def create_dedicated_connection(node: int, isolation_level: str = "REPEATABLE READ") -> mysql.connector.connection.MySQLConnection:
+def create_dedicated_connection(node: int, isolation_level: str = "REPEATABLE READ") -> "mysql.connector.connection.MySQLConnection":
     """
     Create a dedicated connection with specific isolation level.
     Use this for concurrent transaction testing.
+    The connection comes from the node's transaction pool; close() hands it back.
 
     Args:
         node: Node number (1, 2, or 3)
@@ -494,7 +1092,24 @@ def create_dedicated_connection(node: int, isolation_level: str = "REPEATABLE RE
     Returns:
         MySQL connection with isolation level set
     """
-    conn = get_db_connection(node)
+    from mysql.connector import pooling
+    import mysql.connector
+
+    # Borrowed from a pool of its own: the GUI holds these across reruns while a
+    # transaction is pending, which would otherwise tie up the shared pool
+    try:
+        pool = _get_transaction_pool(node)
+    except mysql.connector.Error as db_err:
+        error_code = db_err.errno if hasattr(db_err, 'errno') else 'Unknown'
+        raise _DBError(_CONNECT_DB_ERROR, node, db_err, error_code=error_code)
+
+    try:
+        conn = pool.get_connection()
+    except pooling.PoolError:
+        # Every transaction connection is held by a pending transaction - open a one-off one
+        conn = _open_connection(node)
+
+    # Set on every checkout; the pool resets the session when the connection is returned
     cursor = conn.cursor()
     cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}")
     cursor.close()
@@ -512,11 +1127,10 @@ def check_connectivity() -> Dict[int, bool]:
     for node in [1, 2, 3]:
         try:
             conn = get_db_connection(node)
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-            cursor.close()
-            conn.close()
+            try:
+                conn.ping(reconnect=True, attempts=1, delay=0)
+            finally:
+                conn.close()
             status[node] = True
         except Exception as e:
             print(f"Node {node} connectivity check failed: {e}")
@@ -543,14 +1157,21 @@ def get_max_trans_id_multi_node() -> Dict[str, Any]:
             'error': str (only if status is 'failed')
         }
     """
-    # Check connectivity to all nodes
-    connectivity = check_connectivity()
-    available_nodes = [node for node, is_up in connectivity.items() if is_up]
+    # Ask every node for its MAX(trans_id) at once. A node that answers is up, so
+    # no separate connectivity round-trip is needed before the real query
+    futures = {node: _node_executor.submit(_query_max_trans_id, node) for node in [1, 2, 3]}
+    node_values = {}
+    for node, future in futures.items():
+        try:
+            node_values[node] = future.result()
+        except Exception as e:
+            print(f"Error querying Node {node} for max trans_id: {e}")
+    available_nodes = list(node_values)
 
     # Apply multi-master rules
-    node1_up = connectivity.get(1, False)
-    node2_up = connectivity.get(2, False)
-    node3_up = connectivity.get(3, False)
+    node1_up = 1 in node_values
+    node2_up = 2 in node_values
+    node3_up = 3 in node_values
 
     # Check if we should abort based on failure rules
     if (not node1_up and not node2_up) or (not node1_up and not node3_up):
@@ -572,32 +1193,34 @@ def get_max_trans_id_multi_node() -> Dict[str, Any]:
             'error': 'All database nodes are down.'
         }
 
-    # Query each available node for MAX(trans_id)
-    node_values = {}
-    max_trans_id = 0
-
-    for node in available_nodes:
-        try:
-            conn = get_db_connection(node)
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT COALESCE(MAX(trans_id), 0) as max_id FROM trans FOR UPDATE")
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-
-            if result:
-                node_max_id = int(result['max_id'])
-                node_values[node] = node_max_id
-                max_trans_id = max(max_trans_id, node_max_id)
-        except Exception as e:
-            print(f"Error querying Node {node} for max trans_id: {e}")
-            # Node became unavailable during query, continue with others
-            node_values[node] = None
-
     return {
         'status': 'success',
-        'max_trans_id': max_trans_id,
+        'max_trans_id': max(node_values.values()),
         'available_nodes': available_nodes,
         'node_values': node_values,
         'error': None
-    }
\ No newline at end of file
+    }
+
+
+def _query_max_trans_id(node: int) -> int:
+    """
+    Return the highest trans_id stored on a node.
+
+    Args:
+        node: Node number (1, 2, or 3)
+
+    Returns:
+        int: MAX(trans_id), or 0 for an empty table
+
+    Raises:
+        Exception: If the node cannot be reached or the query fails
+    """
+    conn = get_db_connection(node)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(MAX(trans_id), 0) FROM trans FOR UPDATE")
+        max_id = cursor.fetchone()[0]
+        cursor.close()
+        return int(max_id)
+    finally:
+        conn.close()
@@ -1,6 +1,124 @@
+_write_pools = {}  # Cache for MySQLConnectionPool per (node, isolation_level)
+_write_pools_lock = threading.Lock()
+WRITE_POOL_SIZE = 10  # Max concurrent writers per node (Case #3 runs 10)
+LOCK_MAX_QUEUE_DEPTH = 3  # Writers allowed to wait for one lock before new ones are rejected
+WRITE_PREPARED_CURSORS_PER_CONNECTION = 32  # LRU limit; evicted cursors are closed
+
+def _get_write_pool(node: int, isolation_level: str) -> pooling.MySQLConnectionPool:
+    """
+    Return the write connection pool for a node and isolation level, creating it on first use.
+    Sessions are not reset on return, so the isolation level set on a connection sticks.
+
+    Args:
+        node: Node number (1, 2, or 3)
+        isolation_level: Transaction isolation level of the pool's connections
+
+    Returns:
+        pooling.MySQLConnectionPool: Pool of open connections to the node
+    """
+    key = (node, isolation_level)
+    with _write_pools_lock:
+        if key not in _write_pools:
+            config = get_node_config(node)
+            _write_pools[key] = pooling.MySQLConnectionPool(
+                pool_name=f"write_node{node}_{isolation_level.replace(' ', '_')}",
+                pool_size=WRITE_POOL_SIZE,
+                pool_reset_session=False,
+                host=config["host"],
+                port=config["port"],
+                user=config["user"],
+                password=config["password"],
+                database=config["database"],
+                autocommit=False,
+                connect_timeout=10
+            )
+        return _write_pools[key]
+
+def _write_session_state(conn) -> Dict[str, Any]:
+    """
+    Return the per-session state of a write-pool connection.
+    The state lives on the underlying connection (the pool hands out a new wrapper
+    on every checkout), so it goes away with the connection. When the pool has
+    reconnected the session (new connection_id), a fresh state is started, so the
+    isolation level is SET again on the new session.
+
+    Args:
+        conn: Connection borrowed from _get_write_pool
+
+    Returns:
+        dict: 'connection_id', 'isolation_level' (None until SET on this session) and
+              'cursors' (query -> prepared cursor, least recently used first)
+    """
+    cnx = getattr(conn, '_cnx', conn)
+    state = getattr(cnx, '_write_session', None)
+    if state is None or state['connection_id'] != cnx.connection_id:
+        state = {'connection_id': cnx.connection_id, 'isolation_level': None, 'cursors': OrderedDict()}
+        cnx._write_session = state
+    return state
+
+def _get_write_connection(node: int, isolation_level: str):
+    """
+    Borrow a connection with the given isolation level from the node's write pool.
+    SET TRANSACTION ISOLATION LEVEL is only issued the first time a pooled session
+    is handed out; close() returns the connection to the pool.
+
+    Args:
+        node: Node number (1, 2, or 3)
+        isolation_level: Transaction isolation level
+
+    Returns:
+        MySQL connection with isolation level set
+    """
+    try:
+        conn = _get_write_pool(node, isolation_level).get_connection()
+    except pooling.errors.PoolError:
+        # Every pooled connection is checked out - open a one-off connection instead
+        return create_dedicated_connection(node, isolation_level)
+
+    state = _write_session_state(conn)
+    if state['isolation_level'] != isolation_level:
+        cursor = conn.cursor()
+        cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}")
+        cursor.close()
+        state['isolation_level'] = isolation_level
+    return conn
+
+def _get_write_cursor(conn, query: str):
+    """
+    Return a prepared cursor for a write query on a connection from _get_write_connection.
+    On pooled sessions the cursor is kept and reused, so the server parses the
+    statement once per session and later writes only bind and execute. At most
+    WRITE_PREPARED_CURSORS_PER_CONNECTION cursors are kept per session.
+
+    Args:
+        conn: Connection returned by _get_write_connection
+        query: SQL query the cursor will execute
+
+    Returns:
+        Prepared cursor; close it only if the connection is not pooled
+    """
+    if not isinstance(conn, pooling.PooledMySQLConnection):
+        return conn.cursor(prepared=True)
+
+    cursors = _write_session_state(conn)['cursors']
+    cursor = cursors.get(query)
+    if cursor is not None:
+        cursors.move_to_end(query)
+        return cursor
+
+    cursor = conn.cursor(prepared=True)
+    cursors[query] = cursor
+    if len(cursors) > WRITE_PREPARED_CURSORS_PER_CONNECTION:
+        _, evicted = cursors.popitem(last=False)
+        evicted.close()
+    return cursor
+
+@functools.lru_cache(maxsize=None)
 def _get_lock_manager(current_node_id: str = "app"):
     """
     Get or create the distributed lock manager instance.
+    The instance is cached per current_node_id, so later calls are a single
+    cache lookup.
 
     Args:
         current_node_id: Identifier for this application instance
@@ -11,24 +129,23 @@ def _get_lock_manager(current_node_id: str = "app"):
     # Lazy import to avoid Streamlit module caching issues
     from python.utils.lock_manager import DistributedLockManager
 
-    global _lock_manager
-    if _lock_manager is None:
-        # Build node configs for lock manager
-        lock_node_configs = {}
-        for node_num in [1, 2, 3]:
-            config = get_node_config(node_num)
-            lock_node_configs[node_num] = config
-        _lock_manager = DistributedLockManager(lock_node_configs, current_node_id)
-    return _lock_manager
+    # Build node configs for lock manager
+    lock_node_configs = {}
+    for node_num in [1, 2, 3]:
+        config = get_node_config(node_num)
+        lock_node_configs[node_num] = config
+    return DistributedLockManager(lock_node_configs, current_node_id)
 
 def execute_with_lock(query: str, params: tuple, resource_id: str,
                      target_node: int, isolation_level: str = "READ COMMITTED",
-                     timeout: int = 30, current_node_id: str = "app") -> Dict[str, Any]:
+                     timeout: int = 30, current_node_id: str = "app",
+                     max_queue_depth: Optional[int] = LOCK_MAX_QUEUE_DEPTH) -> Dict[str, Any]:
     """
     Execute a write query with distributed locking.
 
     This method:
-    1. Acquires lock on the resource
+    1. Acquires lock on the resource (distributed for REPEATABLE READ and
+       SERIALIZABLE, in-process only for READ COMMITTED, none for READ UNCOMMITTED)
     2. Executes the query
     3. Commits the transaction
     4. Releases the lock
@@ -41,31 +158,63 @@ def execute_with_lock(query: str, params: tuple, resource_id: str,
         isolation_level: Transaction isolation level
         timeout: Lock acquisition timeout in seconds
         current_node_id: Identifier for this application instance
+        max_queue_depth: Reject instead of waiting when this many writers already
+                         wait for the lock (None waits up to timeout)
 
     Returns:
-        dict with status, affected_rows, and message
+        dict with status ('success', 'failed' or 'rejected'), affected_rows, and message
     """
+    from python.utils.lock_manager import LockQueueFullError
+
     lock_manager = _get_lock_manager(current_node_id)
     conn = None
     cursor = None
 
     try:
-        # Acquire lock on the resource
-        if not lock_manager.acquire_lock(resource_id, target_node, timeout):
+        # Check out the connection before locking, so connection setup is not
+        # part of the locked section
+        conn = _get_write_connection(target_node, isolation_level)
+        cursor = _get_write_cursor(conn, query)
+
+        # Lock as strongly as the isolation level needs: READ UNCOMMITTED relies on
+        # InnoDB's row locks alone, READ COMMITTED only serializes writers in this
+        # process, REPEATABLE READ and SERIALIZABLE take the distributed lock
+        if isolation_level == "READ UNCOMMITTED":
+            release_lock = None
+        elif isolation_level == "READ COMMITTED":
+            lock_acquired = lock_manager.acquire_local_lock(resource_id, target_node, timeout)
+            release_lock = lock_manager.release_local_lock
+        else:
+            try:
+                lock_acquired = lock_manager.acquire_lock(resource_id, target_node, timeout, max_queue_depth)
+            except LockQueueFullError as e:
+                return {
+                    'status': 'rejected',
+                    'error': f'queue full: {e}',
+                    'affected_rows': 0
+                }
+            release_lock = lock_manager.release_lock
+
+        if release_lock and not lock_acquired:
             return {
                 'status': 'failed',
                 'error': f'Failed to acquire lock on {resource_id} at Node {target_node}',
                 'affected_rows': 0
             }
 
-        # Execute the query
-        conn = create_dedicated_connection(target_node, isolation_level)
-        cursor = conn.cursor()
-
-        cursor.execute("START TRANSACTION")
-        cursor.execute(query, params)
-        affected_rows = cursor.rowcount
-        conn.commit()
+        # Execute the query, holding the lock only until the commit
+        try:
+            # autocommit is off, so the first statement opens the transaction
+            cursor.execute(query, params)
+            affected_rows = cursor.rowcount
+            conn.commit()
+        except Exception:
+            # Undo the write before another writer can get the lock
+            conn.rollback()
+            raise
+        finally:
+            if release_lock:
+                release_lock(resource_id, target_node)
 
         return {
             'status': 'success',
@@ -83,10 +232,135 @@ def execute_with_lock(query: str, params: tuple, resource_id: str,
         }
 
     finally:
-        # Always release the lock
-        lock_manager.release_lock(resource_id, target_node)
+        # Prepared cursors on pooled sessions stay open for the next write
+        if cursor and not isinstance(conn, pooling.PooledMySQLConnection):
+            cursor.close()
+        if conn:
+            conn.close()
+
+def execute_optimistic(table: str, key_column: str, key_value: Any, updates: Dict[str, Any],
+                       resource_id: str, target_node: int, version_col: str = "version",
+                       isolation_level: str = "READ COMMITTED", timeout: int = 30,
+                       current_node_id: str = "app") -> Dict[str, Any]:
+    """
+    Update a single row with an optimistic compare-and-set, skipping the lock manager.
+
+    This method:
+    1. Reads the row's current version_col value
+    2. Runs UPDATE ... WHERE key_column = key AND version_col = <value read>
+       (bumping version_col by one unless it is one of the updated columns)
+    3. Falls back to execute_with_lock if the row changed in between (0 rows updated)
+
+    The trans table has no version counter, so callers there can compare on the
+    updated column itself (e.g. version_col="amount").
+
+    Args:
+        table: Table holding the row
+        key_column: Primary key column of the row
+        key_value: Primary key value of the row
+        updates: Column -> new value for the columns to update
+        resource_id: Unique identifier for the resource (used by the locked fallback)
+        target_node: Node where the update should execute
+        version_col: Column compared to detect a concurrent write
+        isolation_level: Transaction isolation level
+        timeout: Lock acquisition timeout in seconds for the fallback
+        current_node_id: Identifier for this application instance
+
+    Returns:
+        dict with status, affected_rows, and message (same shape as execute_with_lock)
+    """
+    set_clause = ", ".join(f"{column} = %s" for column in updates)
+    query = f"UPDATE {table} SET {set_clause} WHERE {key_column} = %s"
+    params = (*updates.values(), key_value)
+
+    cas_set_clause = set_clause if version_col in updates else f"{set_clause}, {version_col} = {version_col} + 1"
+    cas_query = f"UPDATE {table} SET {cas_set_clause} WHERE {key_column} = %s AND {version_col} <=> %s"
+
+    conn = None
+    cursor = None
+
+    try:
+        conn = _get_write_connection(target_node, isolation_level)
+
+        read_cursor = conn.cursor()
+        read_cursor.execute(f"SELECT {version_col} FROM {table} WHERE {key_column} = %s", (key_value,))
+        row = read_cursor.fetchone()
+        read_cursor.close()
+
+        if row is not None:
+            cursor = _get_write_cursor(conn, cas_query)
+            cursor.execute(cas_query, (*params, row[0]))
+            affected_rows = cursor.rowcount
+            conn.commit()
 
-        if cursor:
+            if affected_rows > 0:
+                return {
+                    'status': 'success',
+                    'affected_rows': affected_rows,
+                    'message': f'Query executed optimistically on Node {target_node}'
+                }
+        else:
+            conn.rollback()
+
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        print(f"Optimistic update of {resource_id} on Node {target_node} failed, retrying with lock: {e}")
+
+    finally:
+        # Prepared cursors on pooled sessions stay open for the next write
+        if cursor and not isinstance(conn, pooling.PooledMySQLConnection):
+            cursor.close()
+        if conn:
+            conn.close()
+
+    # Row changed concurrently (or could not be read) - take the lock and write unconditionally
+    return execute_with_lock(query, params, resource_id, target_node, isolation_level,
+                             timeout, current_node_id)
+
+def _execute_on_node(node: int, query: str, params: tuple,
+                     isolation_level: str = "READ COMMITTED") -> Dict[str, Any]:
+    """
+    Execute and commit a write query on a single node.
+
+    Args:
+        node: Node where the query should execute
+        query: SQL query to execute
+        params: Query parameters
+        isolation_level: Transaction isolation level
+
+    Returns:
+        dict with status and affected_rows or error
+    """
+    conn = None
+    cursor = None
+
+    try:
+        conn = _get_write_connection(node, isolation_level)
+        cursor = _get_write_cursor(conn, query)
+
+        # autocommit is off, so the first statement opens the transaction
+        cursor.execute(query, params)
+        affected_rows = cursor.rowcount
+        conn.commit()
+
+        return {
+            'status': 'success',
+            'affected_rows': affected_rows
+        }
+
+    except Exception as e:
+        if conn:
+            conn.rollback()
+
+        return {
+            'status': 'failed',
+            'error': str(e)
+        }
+
+    finally:
+        # Prepared cursors on pooled sessions stay open for the next write
+        if cursor and not isinstance(conn, pooling.PooledMySQLConnection):
             cursor.close()
         if conn:
             conn.close()
@@ -98,7 +372,10 @@ def execute_multi_node_write(query: str, params: tuple, resource_id: str,
     Execute the same write query across multiple nodes with distributed locking.
 
     This is for replication scenarios where the same update must happen on
-    multiple nodes atomically.
+    multiple nodes. Once the locks are held the per-node writes are independent,
+    so they run in parallel (one thread per node). The writes are NOT atomic
+    across nodes: each node commits on its own, so when one node fails the others
+    may already have committed. 'results' always holds every node's outcome.
 
     Args:
         query: SQL query to execute
@@ -110,60 +387,42 @@ def execute_multi_node_write(query: str, params: tuple, resource_id: str,
         current_node_id: Identifier for this application instance
 
     Returns:
-        dict with status and results per node
+        dict with status and results per node ('failed' if any node failed)
     """
+    from concurrent.futures import ThreadPoolExecutor
+
     lock_manager = _get_lock_manager(current_node_id)
+    node_locks = [(resource_id, node) for node in nodes]
     results = {}
 
     try:
-        # Acquire locks on all nodes
-        if not lock_manager.acquire_multi_node_lock(resource_id, nodes, timeout):
+        # Acquire locks on all nodes as one all-or-nothing batch
+        if not lock_manager.acquire_locks(node_locks, timeout):
             return {
                 'status': 'failed',
                 'error': 'Failed to acquire locks on all nodes',
                 'results': {}
             }
 
-        # Execute on all nodes
-        for node in nodes:
-            conn = None
-            cursor = None
-
-            try:
-                conn = create_dedicated_connection(node, isolation_level)
-                cursor = conn.cursor()
-
-                cursor.execute("START TRANSACTION")
-                cursor.execute(query, params)
-                affected_rows = cursor.rowcount
-                conn.commit()
-
-                results[node] = {
-                    'status': 'success',
-                    'affected_rows': affected_rows
-                }
-
-            except Exception as e:
-                if conn:
-                    conn.rollback()
-
-                results[node] = {
-                    'status': 'failed',
-                    'error': str(e)
-                }
+        # Execute on all nodes in parallel
+        with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+            futures = {
+                executor.submit(_execute_on_node, node, query, params, isolation_level): node
+                for node in nodes
+            }
 
-                # If any node fails, mark overall status as failed
-                return {
-                    'status': 'failed',
-                    'error': f'Failed on Node {node}: {e}',
-                    'results': results
-                }
+            # Every write has already started, so wait for all of them and report
+            # each node's outcome (nodes that committed stay committed)
+            for future, node in futures.items():
+                results[node] = future.result()
 
-            finally:
-                if cursor:
-                    cursor.close()
-                if conn:
-                    conn.close()
+        failed_nodes = [node for node in nodes if results[node]['status'] == 'failed']
+        if failed_nodes:
+            return {
+                'status': 'failed',
+                'error': "; ".join(f"Failed on Node {node}: {results[node]['error']}" for node in failed_nodes),
+                'results': results
+            }
 
         return {
             'status': 'success',
@@ -173,8 +432,7 @@ def execute_multi_node_write(query: str, params: tuple, resource_id: str,
 
     finally:
         # Always release locks on all nodes
-        lock_manager.release_multi_node_lock(resource_id, nodes)
-
+        lock_manager.release_locks(node_locks)
 
 def replicate_write(query: str, params: tuple, resource_id: str,
                    source_node: int, isolation_level: str = "READ COMMITTED",
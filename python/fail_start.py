@@ -98,7 +98,8 @@ def kill_user_sessions(node, username='user'):
 
     try:
         conn = get_root_connection(node)
-        cursor = conn.cursor(buffered=True)
+        # Unbuffered: the rows are read once by fetchall() below, not copied into a buffer first
+        cursor = conn.cursor()
 
         # First, get all process IDs for the user
         list_query = f"""
@@ -187,15 +188,13 @@ def revoke_privileges(node, username='user'):
                 kill_commands = result[0]
                 print(f"  [Node {node}] Killing {len(kill_commands.split(';'))-1} existing connection(s)...")
 
-                # Execute kill commands using prepared statement
+                # Send every KILL in one multi-statement batch (one round-trip)
                 try:
-                    cursor.execute(f"SET @kills = (SELECT GROUP_CONCAT(CONCAT('KILL ', id, ';') SEPARATOR ' ') FROM information_schema.processlist WHERE user = '{username}')")
-                    cursor.execute("PREPARE stmt FROM @kills")
-                    cursor.execute("EXECUTE stmt")
-                    cursor.execute("DEALLOCATE PREPARE stmt")
+                    for _ in cursor.execute(kill_commands, multi=True):
+                        pass
                     print(f"  [Node {node}] Successfully killed all connections for user '{username}'")
                 except mysql.connector.Error as e:
-                    # If prepared statement fails, try individual kills
+                    # A KILL in the batch failed (e.g. connection already gone) - try individual kills
                     for kill_cmd in kill_commands.split(';'):
                         kill_cmd = kill_cmd.strip()
                         if kill_cmd:
@@ -6,6 +6,7 @@ This module contains the original logic for adding transactions.
 import streamlit as st
 import pandas as pd
 import time
+from datetime import datetime
 import sys
 import os
 
@@ -14,14 +15,19 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 from python.db.db_config import create_dedicated_connection, get_max_trans_id_multi_node
 
+# Values are bound by the driver (escaped, so user text can't change the statement)
+INSERT_TRANS_QUERY = (
+    "INSERT INTO trans (trans_id, account_id, newdate, type, operation, amount, k_symbol) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+)
 
-def render(get_node_for_account, log_transaction):
+
+def render(log_transactions):
     """
     Render the Add Transaction page with the old logic.
 
     Args:
-        get_node_for_account: Function to determine which node to use based on account_id
-        log_transaction: Function to log transactions
+        log_transactions: Function to log a batch of transactions with one write
     """
     st.title("Add New Transaction (Write Operation)")
 
@@ -57,30 +63,6 @@ def render(get_node_for_account, log_transaction):
     # Show next trans_id that will be used
     st.info("ℹ️ The next available trans_id will be automatically fetched and assigned")
 
-    # Insert button with custom styling
-    st.markdown("""
-    <style>
-    div.stButton > button {
-        background-color: #4B5C4B;
-        color: white;
-        border-color: #4B5C4B;
-    }
-    div.stButton > button:hover {
-        background-color: #3A4A3A;
-        border-color: #3A4A3A;
-    }
-    /* Rollback button styling */
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")) {
-        background-color: #692727 !important;
-        border-color: #692727 !important;
-    }
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")):hover {
-        background-color: #531F1F !important;
-        border-color: #531F1F !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
     btn_col1, btn_col2, btn_col3 = st.columns(3)
     with btn_col1:
         insert_button = st.button("💾 Insert Transaction", type="primary", use_container_width=True)
@@ -96,16 +78,13 @@ def render(get_node_for_account, log_transaction):
         if add_transactions:
             try:
                 committed_count = 0
-                indices_to_remove = []
+                log_entries = []  # Written together once the loop is done
                 processed_trans_ids = set()  # Track which trans_ids have been processed
 
                 # Process transactions one by one
                 for txn in add_transactions:
-                    idx = st.session_state.active_transactions.index(txn)
-                    indices_to_remove.append(idx)
-
-                    conn = st.session_state.transaction_connections[idx]
-                    cursor = st.session_state.transaction_cursors[idx]
+                    conn = txn['conn']
+                    cursor = txn['cursor']
                     
                     # Get transaction details
                     primary_node = txn['node']
@@ -159,23 +138,22 @@ def render(get_node_for_account, log_transaction):
                                             new_trans_id = max_result['max_trans_id'] + 1
                                             st.info(f"🔄 Retrying with new trans_id: {new_trans_id} (was {trans_id})")
                                             
-                                            # Rebuild INSERT query with new trans_id
-                                            new_query = query.replace(f"VALUES ({trans_id},", f"VALUES ({new_trans_id},")
-                                            
-                                            # Re-execute INSERT with new ID
-                                            cursor = conn.cursor(dictionary=True)
-                                            cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}")
-                                            cursor.execute("START TRANSACTION")
-                                            cursor.execute(new_query)
+                                            # Re-execute INSERT with new ID, same other values
+                                            new_params = (new_trans_id,) + tuple(txn['params'][1:])
+                                            cursor = conn.cursor()
+                                            conn.start_transaction()
+                                            cursor.execute(INSERT_TRANS_QUERY, new_params)
+                                            new_query = cursor.statement
                                             
                                             # Update transaction metadata
                                             txn['trans_id'] = new_trans_id
                                             txn['query'] = new_query
+                                            txn['params'] = new_params
                                             trans_id = new_trans_id
                                             query = new_query
                                             
                                             # Update cursor reference
-                                            st.session_state.transaction_cursors[idx] = cursor
+                                            txn['cursor'] = cursor
                                             
                                         except Exception as retry_error:
                                             st.error(f"Retry failed: {str(retry_error)}")
@@ -197,7 +175,7 @@ def render(get_node_for_account, log_transaction):
                         try:
                             # Get current node status for replication decisions
                             current_node_status = st.session_state.node_pinger.get_status()
-                            partition_node_for_account = get_node_for_account(account_id)
+                            partition_node_for_account = 3 - (account_id & 1)
                             
                             # Determine replication targets based on primary node
                             replication_results = []
@@ -248,14 +226,15 @@ def render(get_node_for_account, log_transaction):
                             
                             # Log successful transaction
                             duration = time.time() - txn['start_time']
-                            log_transaction(
-                                operation=txn['operation'],
-                                query=txn['query'],
-                                node=txn['node'],
-                                isolation_level=txn['isolation_level'],
-                                status='SUCCESS',
-                                duration=duration
-                            )
+                            log_entries.append({
+                                'timestamp': datetime.now().isoformat(),
+                                'operation': txn['operation'],
+                                'query': txn['query'],
+                                'node': txn['node'],
+                                'isolation_level': txn['isolation_level'],
+                                'status': 'SUCCESS',
+                                'duration': duration
+                            })
                             committed_count += 1
                             processed_trans_ids.add(trans_id)
                             
@@ -295,11 +274,12 @@ def render(get_node_for_account, log_transaction):
                             except:
                                 pass
 
+                # Log every committed transaction with one write
+                if log_entries:
+                    log_transactions(log_entries)
+
                 # Remove processed transactions
-                for idx in sorted(indices_to_remove, reverse=True):
-                    del st.session_state.active_transactions[idx]
-                    del st.session_state.transaction_connections[idx]
-                    del st.session_state.transaction_cursors[idx]
+                st.session_state.active_transactions = [t for t in st.session_state.active_transactions if t.get('page') != 'add']
 
                 if committed_count > 0:
                     st.success(f"{committed_count} transaction(s) committed successfully!")
@@ -315,15 +295,11 @@ def render(get_node_for_account, log_transaction):
         if add_transactions:
             try:
                 rolled_back_count = 0
-                indices_to_remove = []
 
-                # Collect indices and rollback transactions
+                # Roll back each transaction
                 for txn in add_transactions:
-                    idx = st.session_state.active_transactions.index(txn)
-                    indices_to_remove.append(idx)
-
-                    conn = st.session_state.transaction_connections[idx]
-                    cursor = st.session_state.transaction_cursors[idx]
+                    conn = txn['conn']
+                    cursor = txn['cursor']
                     conn.rollback()
                     cursor.close()
                     conn.close()
@@ -335,11 +311,8 @@ def render(get_node_for_account, log_transaction):
                     
                     rolled_back_count += 1
 
-                # Remove in reverse order to maintain correct indices
-                for idx in sorted(indices_to_remove, reverse=True):
-                    del st.session_state.active_transactions[idx]
-                    del st.session_state.transaction_connections[idx]
-                    del st.session_state.transaction_cursors[idx]
+                # Remove processed transactions
+                st.session_state.active_transactions = [t for t in st.session_state.active_transactions if t.get('page') != 'add']
 
                 st.info(f"↩️ {rolled_back_count} insert transaction(s) rolled back - no changes made or logged")
                 st.toast(f"{rolled_back_count} transaction(s) rolled back")
@@ -388,7 +361,8 @@ def render(get_node_for_account, log_transaction):
             node_status = st.session_state.node_pinger.get_status()
             
             # Determine primary node with robust fallback logic
-            partition_node = get_node_for_account(account_id)
+            # Even accounts live on Node 2, odd accounts on Node 3
+            partition_node = 3 - (account_id & 1)
             
             # Priority: Node 1 > Partition Node > Any Available Node
             if node_status.get(1, False):  # Node 1 is online (highest priority)
@@ -461,31 +435,30 @@ def render(get_node_for_account, log_transaction):
                     st.success(f"Selected highest trans_id: {max_result['max_trans_id']} → Next: {next_trans_id}")
 
             with st.spinner(f"Preparing insert transaction on Node {primary_node}..."):
-                # Build INSERT query with trans_id
-                insert_query = f"""
-                INSERT INTO trans (trans_id, account_id, newdate, type, operation, amount, k_symbol)
-                VALUES ({next_trans_id}, {account_id}, '{trans_date}', '{trans_type}', '{operation}', {amount}, '{k_symbol}')
-                """
+                # INSERT values, bound to INSERT_TRANS_QUERY's placeholders
+                insert_params = (next_trans_id, account_id, trans_date, trans_type, operation, amount, k_symbol)
 
                 # Create dedicated connection to primary node only
                 conn = create_dedicated_connection(primary_node, isolation_level)
-                cursor = conn.cursor(dictionary=True)
+                cursor = conn.cursor()
 
-                # Set isolation level and start transaction
-                cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}")
-                cursor.execute("START TRANSACTION")
+                # The session isolation level is set by create_dedicated_connection
+                conn.start_transaction()
 
                 # Execute insert but don't commit yet
-                cursor.execute(insert_query)
+                cursor.execute(INSERT_TRANS_QUERY, insert_params)
+                # The statement as sent (values inlined and escaped), replayed on replicas and in recovery logs
+                insert_query = cursor.statement
 
                 # Store single transaction for commit/rollback
-                st.session_state.transaction_connections.append(conn)
-                st.session_state.transaction_cursors.append(cursor)
                 st.session_state.active_transactions.append({
+                    'conn': conn,
+                    'cursor': cursor,
                     'page': 'add',
                     'node': primary_node,
                     'operation': 'INSERT',
                     'query': insert_query,
+                    'params': insert_params,
                     'isolation_level': isolation_level,
                     'start_time': start_time,
                     'trans_id': next_trans_id,
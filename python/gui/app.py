@@ -5,6 +5,8 @@ Users perform CRUD operations; System logs concurrent transactions automatically
 
 import streamlit as st
 from datetime import datetime
+import atexit
+import collections
 import json
 import sys
 import os
@@ -24,28 +26,24 @@ if python_dir not in sys.path:
 # Try multiple import strategies to work in different environments
 try:
     # Strategy 1: Absolute import from project root
-    from python.db.db_config import fetch_data, execute_query, get_node_config, NODE_USE
+    from python.db.db_config import get_node_config, NODE_USE
     from python.utils.lock_manager import DistributedLockManager
-    from python.utils.server_ping import NodePinger
+    from python.utils.server_ping import NodePinger, NodeCountRefresher
     import python.gui.view_transactions as view_transactions
     import python.gui.view_reports as view_reports
     import python.gui.add_transaction as add_transaction
     import python.gui.update_transaction as update_transaction
     import python.gui.delete_transaction as delete_transaction
-    import python.gui.transaction_log as transaction_log
-    import python.gui.test_case1 as test_case1
 except ImportError:
     # Strategy 2: Relative import from python directory
-    from db.db_config import fetch_data, execute_query, get_node_config, NODE_USE
+    from db.db_config import get_node_config, NODE_USE
     from utils.lock_manager import DistributedLockManager
-    from utils.server_ping import NodePinger
+    from utils.server_ping import NodePinger, NodeCountRefresher
     import gui.view_transactions as view_transactions
     import gui.view_reports as view_reports
     import gui.add_transaction as add_transaction
     import gui.update_transaction as update_transaction
     import gui.delete_transaction as delete_transaction
-    import gui.transaction_log as transaction_log
-    import gui.test_case1 as test_case1
 
 st.set_page_config(
     page_title="Transaction Manager",
@@ -53,17 +51,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Most recent log entries kept per session; the full history is in transaction_log.json
+TRANSACTION_LOG_MAX_ENTRIES = 10_000
+
 # Initialize session state for transaction tracking
 if 'transaction_log' not in st.session_state:
-    st.session_state.transaction_log = []
+    st.session_state.transaction_log = collections.deque(maxlen=TRANSACTION_LOG_MAX_ENTRIES)
 
 # Initialize session state for active transactions (multiple pending transactions)
 if 'active_transactions' not in st.session_state:
-    st.session_state.active_transactions = []  # List of transaction metadata
-if 'transaction_connections' not in st.session_state:
-    st.session_state.transaction_connections = []  # Parallel list of MySQL connections
-if 'transaction_cursors' not in st.session_state:
-    st.session_state.transaction_cursors = []  # Parallel list of cursors
+    st.session_state.active_transactions = []  # Transaction dicts: metadata plus its 'conn' and 'cursor'
 
 # Initialize distributed lock manager
 if 'lock_manager' not in st.session_state:
@@ -104,98 +101,141 @@ page = st.sidebar.radio(
     ]
 )
 
-# Helper function to determine node based on account_id
-def get_node_for_account(account_id):
+# One count refresher shared by every session; reruns only read its latest values
+@st.cache_resource
+def get_count_refresher():
+    """Start and return the background thread that keeps per-node row counts"""
+    refresher = NodeCountRefresher(interval=5)
+    # Fill the counts once up front so the first page load has values to show
+    refresher.refresh_all()
+    refresher.start()
+    return refresher
+
+# One append handle to the persistent log, shared by every session
+@st.cache_resource
+def _get_log_writer():
+    """Open transaction_log.json once; each batch of lines goes to disk in a single flushed write"""
+    log_file = open('transaction_log.json', 'ab', buffering=65536)
+    atexit.register(log_file.close)
+    return log_file
+
+# Helper functions to log transactions
+def log_transactions(entries):
     """
-    Determine which node to use based on account_id
-    Node 1: Central (all data)
-    Node 2: Even account_id
-    Node 3: Odd account_id
+    Log a batch of transactions for later analysis with one write to the log file.
+
+    Args:
+        entries: List of log entry dicts (timestamp, operation, query, node,
+                 isolation_level, status, duration)
     """
-    if account_id % 2 == 0:
-        return 2
-    else:
-        return 3
+    user_session = st.session_state.get('user_id', 'anonymous')
+    for log_entry in entries:
+        log_entry['user_session'] = user_session
+
+    st.session_state.transaction_log.extend(entries)
+
+    # Also save to file for persistence. Flushed right away so committed
+    # transactions are on disk even if the process is killed without running atexit
+    log_writer = _get_log_writer()
+    log_writer.write(''.join(json.dumps(log_entry) + '\n' for log_entry in entries).encode())
+    log_writer.flush()
 
-# Helper function to log transactions
 def log_transaction(operation, query, node, isolation_level, status, duration):
     """Log transaction for later analysis"""
-    log_entry = {
+    log_transactions([{
         'timestamp': datetime.now().isoformat(),
         'operation': operation,
         'query': query,
         'node': node,
         'isolation_level': isolation_level,
         'status': status,
-        'duration': duration,
-        'user_session': st.session_state.get('user_id', 'anonymous')
-    }
-
-    st.session_state.transaction_log.append(log_entry)
+        'duration': duration
+    }])
+
+# Button styling shared by the View, Add, Update and Delete pages
+_CSS = """
+<style>
+div.stButton > button {
+    background-color: #4B5C4B;
+    color: white;
+    border-color: #4B5C4B;
+}
+div.stButton > button:hover {
+    background-color: #3A4A3A;
+    border-color: #3A4A3A;
+}
+/* Rollback button styling */
+button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")) {
+    background-color: #692727 !important;
+    border-color: #692727 !important;
+}
+button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")):hover {
+    background-color: #531F1F !important;
+    border-color: #531F1F !important;
+}
+</style>
+"""
 
-    # Also save to file for persistence
-    with open('transaction_log.json', 'a') as f:
-        f.write(json.dumps(log_entry) + '\n')
+def render_home():
+    st.title("Distributed Database Transaction Manager")
 
-def main():
-    # No automatic recovery notifications
+    st.markdown(f"""
+    ## Welcome to the Transaction Manager
     
-    # ============================================================================
-    # HOME PAGE
-    # ============================================================================
-    if page == "Home":
-        st.title("Distributed Database Transaction Manager")
-
-        st.markdown(f"""
-        ## Welcome to the Transaction Manager
-        
-        Connected to Node {NODE_USE}
-                    
-        """)
-
-        # Show node status
-        st.markdown("---")
-        st.subheader("📊 Current Node Status")
-
-        col1, col2, col3 = st.columns(3)
-
-        try:
-            node1_count = fetch_data("SELECT COUNT(*) as count FROM trans", node=1)['count'][0]
-            node2_count = fetch_data("SELECT COUNT(*) as count FROM trans", node=2)['count'][0]
-            node3_count = fetch_data("SELECT COUNT(*) as count FROM trans", node=3)['count'][0]
-
-            with col1:
-                st.metric("Node 1 (Central)", "Active", f"{node1_count:,} rows")
-            with col2:
-                st.metric("Node 2 (Even Accounts)", "Active", f"{node2_count:,} rows")
-            with col3:
-                st.metric("Node 3 (Odd Accounts)", "Active", f"{node3_count:,} rows")
+    Connected to Node {NODE_USE}
                 
-        except Exception as e:
-            st.error(f"⚠️ Database connection issue: {str(e)}")
-        
-        # Recovery system is now manual-only (triggered before each transaction)
-
-    elif page == "View Transactions":
-        view_transactions.render(get_node_for_account, log_transaction)
-
-    elif page == "Add Transaction":
-        add_transaction.render(get_node_for_account, log_transaction)
+    """)
+
+    # Show node status
+    st.markdown("---")
+    st.subheader("📊 Current Node Status")
+
+    col1, col2, col3 = st.columns(3)
+
+    refresher = get_count_refresher()
+    # Refresh counts right away instead of waiting for the next background pass
+    if st.sidebar.button("Refresh"):
+        refresher.refresh_all()
+    counts = refresher.get_counts()
+    last_refresh = refresher.get_last_refresh()
+
+    node_labels = {1: "Node 1 (Central)", 2: "Node 2 (Even Accounts)", 3: "Node 3 (Odd Accounts)"}
+    for col, node in zip((col1, col2, col3), (1, 2, 3)):
+        with col:
+            if counts[node] is not None:
+                st.metric(node_labels[node], "Active", f"{counts[node]:,} rows")
+            else:
+                st.metric(node_labels[node], "Offline")
+
+    refreshed = [t for t in last_refresh.values() if t is not None]
+    if refreshed:
+        age = (datetime.now() - min(refreshed)).total_seconds()
+        st.caption(f"Row counts updated {age:.0f}s ago")
+    else:
+        st.caption("Row counts are loading...")
+    
+    # Recovery system is now manual-only (triggered before each transaction)
 
-    elif page == "Update Transaction":
-        update_transaction.render(get_node_for_account, log_transaction)
 
-    elif page == "Delete Transaction":
-        delete_transaction.render(get_node_for_account, log_transaction)
+# Page name -> render callable; the sidebar selection is resolved with one lookup
+PAGES = {
+    "Home": render_home,
+    "View Transactions": lambda: view_transactions.render(log_transaction),
+    "Add Transaction": lambda: add_transaction.render(log_transactions),
+    "Update Transaction": lambda: update_transaction.render(log_transactions),
+    "Delete Transaction": lambda: delete_transaction.render(log_transactions),
+    "View Reports": view_reports.render,
+    # "Transaction Log": transaction_log.render,
+    # "Test Case #1": test_case1.render,
+}
 
-    elif page == "View Reports":
-        view_reports.render()
+def main():
+    # Streamlit drops elements a rerun does not re-emit, so the styles go out once per run here
+    st.markdown(_CSS, unsafe_allow_html=True)
 
-    # elif page == "Transaction Log":
-    #     transaction_log.render()
+    # No automatic recovery notifications
 
-    # elif page == "Test Case #1":
-    #     test_case1.render()
+    PAGES[page]()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
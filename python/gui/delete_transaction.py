@@ -6,22 +6,22 @@ This module contains the original logic for deleting transactions.
 import streamlit as st
 import pandas as pd
 import time
+from datetime import datetime
 import sys
 import os
 
 # Add parent directory to path for imports (fixes Streamlit Cloud deployment)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from python.db.db_config import fetch_data, create_dedicated_connection
+from python.db.db_config import fetch_data, fetch_data_all_nodes, create_dedicated_connection
 
 
-def render(get_node_for_account, log_transaction):
+def render(log_transactions):
     """
     Render the Delete Transaction page with the old logic.
 
     Args:
-        get_node_for_account: Function to determine which node to use based on account_id
-        log_transaction: Function to log transactions
+        log_transactions: Function to log a batch of transactions with one write
     """
     st.title("Delete Transaction (Write Operation)")
 
@@ -62,32 +62,36 @@ def render(get_node_for_account, log_transaction):
             search_results = []
             
             with st.spinner(f"Searching for transaction {trans_id} across all available nodes (fresh data)..."):
-                # Try Node 1 first with fresh data (ttl=0 to bypass cache)
+                # Query every online node at once with fresh data (ttl=0 to bypass cache)
+                online_nodes = [node for node in [1, 2, 3] if node_status.get(node, False)]
+                node_results = fetch_data_all_nodes(search_query, nodes=online_nodes, ttl=0)
+
+                # Node 1 first
                 if node_status.get(1, False):
-                    try:
-                        found_data = fetch_data(search_query, node=1, ttl=0)  # Force fresh data
-                        if not found_data.empty:
-                            search_results.append(("Node 1 (Central)", found_data))
-                            st.success("Transaction found on Node 1 (central)")
-                        else:
-                            st.info("Transaction not found on Node 1")
-                    except Exception as e:
-                        st.warning(f"Could not search Node 1: {str(e)}")
+                    node_data = node_results[1]
+                    if isinstance(node_data, Exception):
+                        st.warning(f"Could not search Node 1: {str(node_data)}")
+                    elif not node_data.empty:
+                        found_data = node_data
+                        search_results.append(("Node 1 (Central)", found_data))
+                        st.success("Transaction found on Node 1 (central)")
+                    else:
+                        found_data = node_data
+                        st.info("Transaction not found on Node 1")
                 else:
                     st.warning("Node 1 is offline - cannot search central database")
                 
-                # Search other nodes regardless to check for inconsistencies
+                # Check other nodes regardless to check for inconsistencies
                 for node in [2, 3]:
                     if node_status.get(node, False):
-                        try:
-                            node_data = fetch_data(search_query, node=node, ttl=0)  # Force fresh data
-                            if not node_data.empty:
-                                search_results.append((f"Node {node}", node_data))
-                                if found_data is None or found_data.empty:
-                                    found_data = node_data
-                                    st.info(f"Transaction found on Node {node}")
-                        except Exception as e:
-                            st.warning(f"Could not search Node {node}: {str(e)}")
+                        node_data = node_results[node]
+                        if isinstance(node_data, Exception):
+                            st.warning(f"Could not search Node {node}: {str(node_data)}")
+                        elif not node_data.empty:
+                            search_results.append((f"Node {node}", node_data))
+                            if found_data is None or found_data.empty:
+                                found_data = node_data
+                                st.info(f"Transaction found on Node {node}")
                     else:
                         st.warning(f"Node {node} is offline")
 
@@ -175,30 +179,6 @@ def render(get_node_for_account, log_transaction):
     st.markdown("---")
     st.warning("This action cannot be undone!")
 
-    # Delete button with custom styling
-    st.markdown("""
-    <style>
-    div.stButton > button {
-        background-color: #4B5C4B;
-        color: white;
-        border-color: #4B5C4B;
-    }
-    div.stButton > button:hover {
-        background-color: #3A4A3A;
-        border-color: #3A4A3A;
-    }
-    /* Rollback button styling */
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")) {
-        background-color: #692727 !important;
-        border-color: #692727 !important;
-    }
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")):hover {
-        background-color: #531F1F !important;
-        border-color: #531F1F !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
     btn_col1, btn_col2, btn_col3 = st.columns(3)
     with btn_col1:
         delete_button = st.button("Delete Transaction", type="primary", use_container_width=True)
@@ -214,15 +194,12 @@ def render(get_node_for_account, log_transaction):
         if delete_transactions:
             try:
                 committed_count = 0
-                indices_to_remove = []
+                log_entries = []  # Written together once the loop is done
 
                 # Process transactions one by one
                 for txn in delete_transactions:
-                    idx = st.session_state.active_transactions.index(txn)
-                    indices_to_remove.append(idx)
-
-                    conn = st.session_state.transaction_connections[idx]
-                    cursor = st.session_state.transaction_cursors[idx]
+                    conn = txn['conn']
+                    cursor = txn['cursor']
                     
                     # Get transaction details and lock state
                     primary_node = txn['node']
@@ -245,7 +222,7 @@ def render(get_node_for_account, log_transaction):
                         
                         # Get current node status for replication decisions
                         current_node_status = st.session_state.node_pinger.get_status()
-                        partition_node_for_account = get_node_for_account(account_id)
+                        partition_node_for_account = 3 - (account_id & 1)
                         
                         # Determine replication targets based on primary node
                         replication_results = []
@@ -296,14 +273,15 @@ def render(get_node_for_account, log_transaction):
                         
                         # Log successful transaction
                         duration = time.time() - txn['start_time']
-                        log_transaction(
-                            operation=txn['operation'],
-                            query=txn['query'],
-                            node=txn['node'],
-                            isolation_level=txn['isolation_level'],
-                            status='SUCCESS',
-                            duration=duration
-                        )
+                        log_entries.append({
+                            'timestamp': datetime.now().isoformat(),
+                            'operation': txn['operation'],
+                            'query': txn['query'],
+                            'node': txn['node'],
+                            'isolation_level': txn['isolation_level'],
+                            'status': 'SUCCESS',
+                            'duration': duration
+                        })
                         committed_count += 1
                         
                         # Store successful deletion for confirmation
@@ -328,11 +306,12 @@ def render(get_node_for_account, log_transaction):
                             st.session_state.lock_manager.release_multi_node_lock(resource_id, nodes=[1, 2, 3])
                             st.info("🔓 Lock released (2PL shrinking phase)")
 
+                # Log every committed transaction with one write
+                if log_entries:
+                    log_transactions(log_entries)
+
                 # Remove processed transactions
-                for idx in sorted(indices_to_remove, reverse=True):
-                    del st.session_state.active_transactions[idx]
-                    del st.session_state.transaction_connections[idx]
-                    del st.session_state.transaction_cursors[idx]
+                st.session_state.active_transactions = [t for t in st.session_state.active_transactions if t.get('page') != 'delete']
 
                 if committed_count > 0:
                     st.success(f"{committed_count} delete transaction(s) committed successfully!")
@@ -348,15 +327,11 @@ def render(get_node_for_account, log_transaction):
         if delete_transactions:
             try:
                 rolled_back_count = 0
-                indices_to_remove = []
 
-                # Collect indices and rollback transactions
+                # Roll back each transaction
                 for txn in delete_transactions:
-                    idx = st.session_state.active_transactions.index(txn)
-                    indices_to_remove.append(idx)
-
-                    conn = st.session_state.transaction_connections[idx]
-                    cursor = st.session_state.transaction_cursors[idx]
+                    conn = txn['conn']
+                    cursor = txn['cursor']
                     conn.rollback()
                     cursor.close()
                     conn.close()
@@ -368,11 +343,8 @@ def render(get_node_for_account, log_transaction):
                     
                     rolled_back_count += 1
 
-                # Remove in reverse order to maintain correct indices
-                for idx in sorted(indices_to_remove, reverse=True):
-                    del st.session_state.active_transactions[idx]
-                    del st.session_state.transaction_connections[idx]
-                    del st.session_state.transaction_cursors[idx]
+                # Remove processed transactions
+                st.session_state.active_transactions = [t for t in st.session_state.active_transactions if t.get('page') != 'delete']
 
                 st.info(f"{rolled_back_count} delete transaction(s) rolled back - data not deleted, no changes logged")
                 st.toast(f"{rolled_back_count} transaction(s) rolled back")
@@ -469,7 +441,8 @@ def render(get_node_for_account, log_transaction):
                     st.stop()
 
             # Show current node status
-            partition_node = get_node_for_account(account_id)
+            # Even accounts live on Node 2, odd accounts on Node 3
+            partition_node = 3 - (account_id & 1)
             
             # Determine primary node (Node 1 priority, fallback logic)
             if node_status.get(1, False):  # Node 1 is online
@@ -522,19 +495,18 @@ def render(get_node_for_account, log_transaction):
             with st.spinner(f"Preparing delete transaction on Node {primary_node}..."):
                 # Create dedicated connection to primary node only
                 conn = create_dedicated_connection(primary_node, isolation_level)
-                cursor = conn.cursor(dictionary=True)
+                cursor = conn.cursor()
 
-                # Set isolation level and start transaction
-                cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}")
-                cursor.execute("START TRANSACTION")
+                # The session isolation level is set by create_dedicated_connection
+                conn.start_transaction()
 
                 # Execute delete but don't commit yet
                 cursor.execute(delete_query)
 
                 # Store single transaction for commit/rollback
-                st.session_state.transaction_connections.append(conn)
-                st.session_state.transaction_cursors.append(cursor)
                 st.session_state.active_transactions.append({
+                    'conn': conn,
+                    'cursor': cursor,
                     'page': 'delete',
                     'node': primary_node,
                     'operation': 'DELETE',
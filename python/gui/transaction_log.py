@@ -22,7 +22,7 @@
 #         st.info("ℹ️ No transactions logged yet. Perform some operations first!")
 #     else:
 #         # Display log
-#         log_df = pd.DataFrame(st.session_state.transaction_log)
+#         log_df = pd.DataFrame(list(st.session_state.transaction_log))
 
 #         st.subheader("All Transactions")
 #         st.dataframe(log_df, use_container_width=True)
@@ -6,6 +6,7 @@ This module contains the original logic for updating transactions.
 import streamlit as st
 import pandas as pd
 import time
+from datetime import datetime
 import sys
 import os
 
@@ -15,13 +16,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 from python.db.db_config import fetch_data, create_dedicated_connection
 
 
-def render(get_node_for_account, log_transaction):
+def render(log_transactions):
     """
     Render the Update Transaction page with the old logic.
 
     Args:
-        get_node_for_account: Function to determine which node to use based on account_id
-        log_transaction: Function to log transactions
+        log_transactions: Function to log a batch of transactions with one write
     """
     st.title("Update Transaction (Write Operation)")
 
@@ -63,30 +63,6 @@ def render(get_node_for_account, log_transaction):
         except Exception as e:
             st.error(f"Error searching: {str(e)}")
 
-    # Update button with custom styling
-    st.markdown("""
-    <style>
-    div.stButton > button {
-        background-color: #4B5C4B;
-        color: white;
-        border-color: #4B5C4B;
-    }
-    div.stButton > button:hover {
-        background-color: #3A4A3A;
-        border-color: #3A4A3A;
-    }
-    /* Rollback button styling */
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")) {
-        background-color: #692727 !important;
-        border-color: #692727 !important;
-    }
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")):hover {
-        background-color: #531F1F !important;
-        border-color: #531F1F !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
     btn_col1, btn_col2, btn_col3 = st.columns(3)
     with btn_col1:
         update_button = st.button("Update Transaction", type="primary", use_container_width=True)
@@ -102,15 +78,12 @@ def render(get_node_for_account, log_transaction):
         if update_transactions:
             try:
                 committed_count = 0
-                indices_to_remove = []
+                log_entries = []  # Written together once the loop is done
 
                 # Process transactions one by one
                 for txn in update_transactions:
-                    idx = st.session_state.active_transactions.index(txn)
-                    indices_to_remove.append(idx)
-
-                    conn = st.session_state.transaction_connections[idx]
-                    cursor = st.session_state.transaction_cursors[idx]
+                    conn = txn['conn']
+                    cursor = txn['cursor']
                     
                     # Get transaction details and lock state
                     primary_node = txn['node']
@@ -133,7 +106,7 @@ def render(get_node_for_account, log_transaction):
                         
                         # Get current node status for replication decisions
                         current_node_status = st.session_state.node_pinger.get_status()
-                        partition_node_for_account = get_node_for_account(account_id)
+                        partition_node_for_account = 3 - (account_id & 1)
                         
                         # Determine replication targets based on primary node
                         replication_results = []
@@ -184,14 +157,15 @@ def render(get_node_for_account, log_transaction):
                         
                         # Log successful transaction
                         duration = time.time() - txn['start_time']
-                        log_transaction(
-                            operation=txn['operation'],
-                            query=txn['query'],
-                            node=txn['node'],
-                            isolation_level=txn['isolation_level'],
-                            status='SUCCESS',
-                            duration=duration
-                        )
+                        log_entries.append({
+                            'timestamp': datetime.now().isoformat(),
+                            'operation': txn['operation'],
+                            'query': txn['query'],
+                            'node': txn['node'],
+                            'isolation_level': txn['isolation_level'],
+                            'status': 'SUCCESS',
+                            'duration': duration
+                        })
                         committed_count += 1
                         
                     except Exception as commit_error:
@@ -208,11 +182,12 @@ def render(get_node_for_account, log_transaction):
                             st.session_state.lock_manager.release_multi_node_lock(resource_id, nodes=[1, 2, 3])
                             st.info("🔓 Lock released (2PL shrinking phase)")
 
+                # Log every committed transaction with one write
+                if log_entries:
+                    log_transactions(log_entries)
+
                 # Remove processed transactions
-                for idx in sorted(indices_to_remove, reverse=True):
-                    del st.session_state.active_transactions[idx]
-                    del st.session_state.transaction_connections[idx]
-                    del st.session_state.transaction_cursors[idx]
+                st.session_state.active_transactions = [t for t in st.session_state.active_transactions if t.get('page') != 'update']
 
                 if committed_count > 0:
                     st.success(f"{committed_count} update transaction(s) committed successfully!")
@@ -228,15 +203,11 @@ def render(get_node_for_account, log_transaction):
         if update_transactions:
             try:
                 rolled_back_count = 0
-                indices_to_remove = []
 
-                # Collect indices and rollback transactions
+                # Roll back each transaction
                 for txn in update_transactions:
-                    idx = st.session_state.active_transactions.index(txn)
-                    indices_to_remove.append(idx)
-
-                    conn = st.session_state.transaction_connections[idx]
-                    cursor = st.session_state.transaction_cursors[idx]
+                    conn = txn['conn']
+                    cursor = txn['cursor']
                     conn.rollback()
                     cursor.close()
                     conn.close()
@@ -248,11 +219,8 @@ def render(get_node_for_account, log_transaction):
                     
                     rolled_back_count += 1
 
-                # Remove in reverse order to maintain correct indices
-                for idx in sorted(indices_to_remove, reverse=True):
-                    del st.session_state.active_transactions[idx]
-                    del st.session_state.transaction_connections[idx]
-                    del st.session_state.transaction_cursors[idx]
+                # Remove processed transactions
+                st.session_state.active_transactions = [t for t in st.session_state.active_transactions if t.get('page') != 'update']
 
                 st.info(f"{rolled_back_count} update transaction(s) rolled back - no changes made or logged")
                 st.toast(f"{rolled_back_count} transaction(s) rolled back")
@@ -332,7 +300,8 @@ def render(get_node_for_account, log_transaction):
                     st.stop()
 
             # Show current node status
-            partition_node = get_node_for_account(account_id)
+            # Even accounts live on Node 2, odd accounts on Node 3
+            partition_node = 3 - (account_id & 1)
             
             # Determine primary node (Node 1 priority, fallback logic)
             if node_status.get(1, False):  # Node 1 is online
@@ -391,19 +360,18 @@ def render(get_node_for_account, log_transaction):
             with st.spinner(f"Preparing update transaction on Node {primary_node}..."):
                 # Create dedicated connection to primary node only
                 conn = create_dedicated_connection(primary_node, isolation_level)
-                cursor = conn.cursor(dictionary=True)
+                cursor = conn.cursor()
 
-                # Set isolation level and start transaction
-                cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}")
-                cursor.execute("START TRANSACTION")
+                # The session isolation level is set by create_dedicated_connection
+                conn.start_transaction()
 
                 # Execute update but don't commit yet
                 cursor.execute(update_query)
 
                 # Store single transaction for commit/rollback
-                st.session_state.transaction_connections.append(conn)
-                st.session_state.transaction_cursors.append(cursor)
                 st.session_state.active_transactions.append({
+                    'conn': conn,
+                    'cursor': cursor,
                     'page': 'update',
                     'node': primary_node,
                     'operation': 'UPDATE',
@@ -1,6 +1,46 @@
 import streamlit as st
-import pandas as pd
-from python.db.db_config import fetch_data
+import time
+from python.db.db_config import fetch_data, get_table_version
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _table_version(node):
+    """Return the trans table's last update time on a node (None if unknown)"""
+    return get_table_version(node)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _report_ipc(query, money_columns=(), version=None):
+    """
+    Run a report query on Node 1, format its money columns and return the
+    result serialized as Arrow IPC bytes, so reruns skip both the query and
+    the DataFrame to Arrow conversion. version is only part of the cache key:
+    a new table version gives a cache miss, an unchanged one a permanent hit.
+    """
+    import pyarrow as pa
+
+    data = fetch_data(query, node=1, ttl=0)
+    for column in money_columns:
+        data[column] = data[column].apply(lambda x: f"${x:,.2f}")
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _report_table(query, money_columns=()):
+    """Return a report as a pyarrow Table read back from the cached IPC bytes"""
+    import pyarrow as pa
+
+    version = _table_version(1)
+    if version is None:
+        # Version unknown - fall back to a short time-based expiry
+        version = f"t{int(time.time()) // 5}"
+    ipc_bytes = _report_ipc(query, tuple(money_columns), version)
+    return pa.ipc.open_stream(ipc_bytes).read_all()
+
 
 def render():
     """Render the View Reports page with aggregated summaries"""
@@ -26,21 +66,18 @@ def render():
         FROM trans
         GROUP BY type
         """
-        type_data = fetch_data(type_query, node=1)
+        type_data = _report_table(type_query, ('total_amount', 'avg_amount'))
         
-        if not type_data.empty:
+        if type_data.num_rows > 0:
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Transaction Counts")
-                st.dataframe(type_data[['type', 'count']], use_container_width=True, hide_index=True)
+                st.dataframe(type_data.select(['type', 'count']), use_container_width=True, hide_index=True)
             
             with col2:
                 st.subheader("Amount Statistics")
-                type_data_formatted = type_data.copy()
-                type_data_formatted['total_amount'] = type_data_formatted['total_amount'].apply(lambda x: f"${x:,.2f}")
-                type_data_formatted['avg_amount'] = type_data_formatted['avg_amount'].apply(lambda x: f"${x:,.2f}")
-                st.dataframe(type_data_formatted[['type', 'total_amount', 'avg_amount']], use_container_width=True, hide_index=True)
+                st.dataframe(type_data.select(['type', 'total_amount', 'avg_amount']), use_container_width=True, hide_index=True)
         
         st.markdown("---")
         
@@ -67,8 +104,8 @@ def render():
             GROUP BY amount_range
             ORDER BY MIN(amount)
             """
-            ranges_data = fetch_data(ranges_query, node=1)
-            if not ranges_data.empty:
+            ranges_data = _report_table(ranges_query)
+            if ranges_data.num_rows > 0:
                 st.dataframe(ranges_data, use_container_width=True, hide_index=True)
         
         with col2:
@@ -79,10 +116,10 @@ def render():
                 MAX(amount) as max_amount
             FROM trans
             """
-            minmax_data = fetch_data(minmax_query, node=1)
-            if not minmax_data.empty:
-                st.metric("Minimum Amount", f"${minmax_data['min_amount'][0]:,.2f}")
-                st.metric("Maximum Amount", f"${minmax_data['max_amount'][0]:,.2f}")
+            minmax_data = _report_table(minmax_query, ('min_amount', 'max_amount'))
+            if minmax_data.num_rows > 0:
+                st.metric("Minimum Amount", minmax_data['min_amount'][0].as_py())
+                st.metric("Maximum Amount", minmax_data['max_amount'][0].as_py())
         
         st.markdown("---")
         
@@ -101,12 +138,10 @@ def render():
         ORDER BY year DESC
         LIMIT 10
         """
-        year_data = fetch_data(year_query, node=1)
+        year_data = _report_table(year_query, ('total_amount',))
         
-        if not year_data.empty:
-            year_data_formatted = year_data.copy()
-            year_data_formatted['total_amount'] = year_data_formatted['total_amount'].apply(lambda x: f"${x:,.2f}")
-            st.dataframe(year_data_formatted, use_container_width=True, hide_index=True)
+        if year_data.num_rows > 0:
+            st.dataframe(year_data, use_container_width=True, hide_index=True)
         
         
     except Exception as e:
@@ -13,10 +13,62 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from python.utils.server_ping import NodePinger
-from python.db.db_config import fetch_data
+from python.db.db_config import fetch_data, fetch_batches
 
+# Whitelist of selectable trans columns (also guards identifier quoting)
+TRANS_COLUMNS = ["trans_id", "account_id", "newdate", "type", "operation", "amount", "k_symbol"]
+DEFAULT_COLUMNS = ["trans_id", "account_id", "newdate", "type", "amount"]
 
-def render(get_node_for_account, log_transaction):
+# Fixed grid geometry so the browser does not re-measure and re-size columns on every rerun
+GRID_WIDTH = 1200
+GRID_HEIGHT = 600
+COLUMN_WIDTHS = {
+    "trans_id": "small",
+    "account_id": "small",
+    "newdate": "medium",
+    "type": "small",
+    "operation": "medium",
+    "amount": "small",
+    "k_symbol": "medium",
+}
+
+
+def _quote_identifier(column):
+    """Quote a trans column name, rejecting anything outside the whitelist"""
+    if column not in TRANS_COLUMNS:
+        raise ValueError(f"Unknown column: {column}")
+    return f"`{column}`"
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _has_rows(node):
+    """Cheap check for whether a node's trans table has any rows at all"""
+    data = fetch_data("SELECT EXISTS(SELECT 1 FROM trans) AS has_rows", node=node, ttl=0)
+    return bool(data['has_rows'][0])
+
+
+def _fetch_streaming(query, node, params=None):
+    """Fetch a node's rows batch by batch, showing them as they arrive"""
+    import pyarrow as pa
+
+    # An empty table cannot match any filter; skip the full query
+    if not _has_rows(node):
+        return pd.DataFrame()
+
+    placeholder = st.empty()
+    tables = []
+    for batch in fetch_batches(query, node, params=params):
+        tables.append(pa.Table.from_batches([batch]))
+        # promote_options lets an all-NULL column in one batch merge with typed batches
+        placeholder.dataframe(pa.concat_tables(tables, promote_options="default"), use_container_width=True)
+    placeholder.empty()
+
+    if not tables:
+        return pd.DataFrame()
+    return pa.concat_tables(tables, promote_options="default").to_pandas()
+
+
+def render(log_transaction):
     """Render the View Transactions page"""
     st.title("View Transactions (Read Operation)")
 
@@ -32,6 +84,11 @@ def render(get_node_for_account, log_transaction):
 
     # Configuration
     limit = st.number_input("Number of rows", min_value=10, max_value=1000, value=50)
+    columns = st.multiselect("Columns", TRANS_COLUMNS, default=DEFAULT_COLUMNS)
+
+    # trans_id is always fetched - it is used for de-duplication and ordering
+    if "trans_id" not in columns:
+        columns = ["trans_id"] + columns
 
     # Filter options
     st.subheader("Filter Options")
@@ -62,42 +119,24 @@ def render(get_node_for_account, log_transaction):
             else:
                 st.error(f"Node {node} Offline")
 
-    # Build query based on filters
-    base_query = "SELECT * FROM trans WHERE 1=1"
-    
+    # Build query based on filters (only the selected columns are fetched)
+    select_list = ", ".join(_quote_identifier(column) for column in columns)
+    base_query = f"SELECT {select_list} FROM trans WHERE 1=1"
+    query_params = []
+
+    # Filter values are bound as parameters, never interpolated into the SQL
     if account_id:
-        base_query += f" AND account_id = {account_id}"
-        
-    if trans_type != "All":
-        base_query += f" AND type = '{trans_type}'"
+        base_query += " AND account_id = %s"
+        query_params.append(account_id)
 
-    # Don't add LIMIT to individual queries - we'll limit the combined result
-    query_without_limit = base_query
-    base_query += f" LIMIT {limit}"
+    if trans_type != "All":
+        base_query += " AND type = %s"
+        query_params.append(trans_type)
 
-    # Execute button with custom styling
-    st.markdown("""
-    <style>
-    div.stButton > button {
-        background-color: #4B5C4B;
-        color: white;
-        border-color: #4B5C4B;
-    }
-    div.stButton > button:hover {
-        background-color: #3A4A3A;
-        border-color: #3A4A3A;
-    }
-    /* Rollback button styling */
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")) {
-        background-color: #692727 !important;
-        border-color: #692727 !important;
-    }
-    button[data-testid="baseButton-secondary"]:has(p:contains("Rollback")):hover {
-        background-color: #531F1F !important;
-        border-color: #531F1F !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Push ORDER BY + LIMIT into every node query; the first `limit` rows of each
+    # node are enough to build the first `limit` rows of the combined result
+    base_query += " ORDER BY trans_id LIMIT %s"
+    query_params.append(int(limit))
 
     btn_col1, btn_col2, btn_col3 = st.columns(3)
     with btn_col1:
@@ -129,20 +168,20 @@ def render(get_node_for_account, log_transaction):
         st.info(f"📡 Online nodes: {online_nodes}, Offline nodes: {offline_nodes}")
         
         try:
-            combined_data = pd.DataFrame()
             query_sources = []
+            node_data = {}  # Per-node results, before de-duplication
             
             with st.spinner("Fetching data from available nodes..."):
                 
                 if account_id:
                     # Specific account query - determine target node
-                    target_node = get_node_for_account(int(account_id))
+                    target_node = 3 - (int(account_id) & 1)  # even -> Node 2, odd -> Node 3
                     
                     if target_node in online_nodes:
                         # Target node is online - query directly
                         st.info(f"🎯 Querying Node {target_node} (target partition for account {account_id})")
-                        data = fetch_data(base_query, node=target_node, ttl=0)
-                        combined_data = pd.concat([combined_data, data], ignore_index=True)
+                        data = _fetch_streaming(base_query, target_node, query_params)
+                        node_data[target_node] = data
                         query_sources.append(f"Node {target_node} (partition)")
                     else:
                         # Target node is offline - check Node 1 (central) if available
@@ -150,8 +189,8 @@ def render(get_node_for_account, log_transaction):
                         
                         if 1 in online_nodes and target_node != 1:
                             st.info("🔄 Searching Node 1 (central) as fallback...")
-                            data = fetch_data(base_query, node=1, ttl=0)
-                            combined_data = pd.concat([combined_data, data], ignore_index=True)
+                            data = _fetch_streaming(base_query, 1, query_params)
+                            node_data[1] = data
                             query_sources.append("Node 1 (central fallback)")
                         else:
                             st.error(f"❌ Cannot query account {account_id}: both Node {target_node} and Node 1 are offline")
@@ -161,8 +200,8 @@ def render(get_node_for_account, log_transaction):
                     if 1 in online_nodes:
                         # Node 1 is online - it has complete data
                         st.info("📊 Node 1 online - querying complete central database")
-                        data = fetch_data(query_without_limit, node=1, ttl=0)
-                        combined_data = pd.concat([combined_data, data], ignore_index=True)
+                        data = _fetch_streaming(base_query, 1, query_params)
+                        node_data[1] = data
                         query_sources.append("Node 1 (complete)")
                         
                     else:
@@ -172,13 +211,19 @@ def render(get_node_for_account, log_transaction):
                         for node in [2, 3]:
                             if node in online_nodes:
                                 st.info(f"📊 Querying Node {node} partition data...")
-                                data = fetch_data(query_without_limit, node=node, ttl=0)
-                                combined_data = pd.concat([combined_data, data], ignore_index=True)
+                                data = _fetch_streaming(base_query, node, query_params)
+                                node_data[node] = data
                                 query_sources.append(f"Node {node} (partition)")
                         
-                        if combined_data.empty:
+                        if all(data.empty for data in node_data.values()):
                             st.error("❌ No partition nodes available - cannot retrieve complete data")
                 
+                # Combine once at the end; a single node's frame is used as-is, not copied
+                if len(node_data) > 1:
+                    combined_data = pd.concat(list(node_data.values()), ignore_index=True)
+                else:
+                    combined_data = next(iter(node_data.values()), pd.DataFrame())
+                
                 # Remove duplicates and apply limit
                 if not combined_data.empty:
                     # Remove duplicates based on trans_id (primary key)
@@ -193,33 +238,97 @@ def render(get_node_for_account, log_transaction):
                     combined_data = combined_data.sort_values('trans_id').head(limit)
                     
             duration = time.time() - start_time
-            
-            if combined_data.empty:
-                st.warning("⚠️ No data found matching your criteria")
-            else:
-                st.success(f"✅ Retrieved {len(combined_data)} rows in {duration:.3f}s")
-                
-                # Show data source information
-                st.info(f"📡 Data sources: {', '.join(query_sources)}")
-                
-                st.dataframe(combined_data, use_container_width=True)
-                
-                # Show strategy details
-                with st.expander("ℹ️ Query Strategy Details"):
-                    st.write(f"**Query Strategy**: {'Single node' if len(query_sources) == 1 else 'Multi-node combination'}")
-                    st.write(f"**Data Sources**: {', '.join(query_sources)}")
-                    st.write(f"**Duration**: {duration:.3f}s")
-                    st.write(f"**Timestamp**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                    st.write(f"**Offline Nodes**: {offline_nodes if offline_nodes else 'None'}")
-                    st.write(f"**Records Retrieved**: {len(combined_data)}")
-                    
-                    if offline_nodes:
-                        st.warning(f"⚠️ Some nodes were offline during this query: {offline_nodes}")
-                        if 1 in offline_nodes and len(online_nodes) > 1:
-                            st.info("✅ Complete data reconstructed from partition nodes")
-                        elif 1 not in offline_nodes:
-                            st.info("✅ Complete data available from central node")
-                
+
+            import pyarrow as pa
+
+            # Keep the result in session state so pagination reruns don't re-query.
+            # It is stored as an Arrow table so each page is a zero-copy slice that
+            # st.dataframe can ship without another pandas -> Arrow conversion.
+            st.session_state.view_result = {
+                'table': pa.Table.from_pandas(combined_data, preserve_index=False),
+                # Per-node tables are only shown as tabs when several nodes were combined
+                'node_tables': {node: pa.Table.from_pandas(data, preserve_index=False) for node, data in node_data.items()} if len(node_data) > 1 else {},
+                'query_sources': query_sources,
+                'duration': duration,
+                'timestamp': datetime.now(),
+                'online_nodes': online_nodes,
+                'offline_nodes': offline_nodes
+            }
+
         except Exception as e:
+            st.session_state.pop('view_result', None)
             st.error(f"❌ Error retrieving data: {str(e)}")
-            st.error("Please check node connectivity and try again")
\ No newline at end of file
+            st.error("Please check node connectivity and try again")
+
+    if 'view_result' in st.session_state:
+        _render_result(st.session_state.view_result)
+
+
+@st.fragment
+def _render_result(result):
+    """Render a fetched result one page at a time"""
+    table = result['table']
+    query_sources = result['query_sources']
+    duration = result['duration']
+    online_nodes = result['online_nodes']
+    offline_nodes = result['offline_nodes']
+
+    if table.num_rows == 0:
+        st.warning("⚠️ No data found matching your criteria")
+        return
+
+    st.success(f"✅ Retrieved {table.num_rows} rows in {duration:.3f}s")
+
+    # Show data source information
+    st.info(f"📡 Data sources: {', '.join(query_sources)}")
+
+    node_tables = result['node_tables']
+    if len(node_tables) > 1:
+        # Every source node's rows are already in memory, so switching tabs never re-queries
+        tabs = st.tabs(["Combined"] + [f"Node {node}" for node in node_tables])
+        with tabs[0]:
+            _render_pages(table, "trans_grid")
+        for tab, (node, node_table) in zip(tabs[1:], node_tables.items()):
+            with tab:
+                _render_pages(node_table, f"trans_grid_node{node}")
+    else:
+        _render_pages(table, "trans_grid")
+
+    # Show strategy details
+    with st.expander("ℹ️ Query Strategy Details"):
+        st.write(f"**Query Strategy**: {'Single node' if len(query_sources) == 1 else 'Multi-node combination'}")
+        st.write(f"**Data Sources**: {', '.join(query_sources)}")
+        st.write(f"**Duration**: {duration:.3f}s")
+        st.write(f"**Timestamp**: {result['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
+        st.write(f"**Offline Nodes**: {offline_nodes if offline_nodes else 'None'}")
+        st.write(f"**Records Retrieved**: {table.num_rows}")
+
+        if offline_nodes:
+            st.warning(f"⚠️ Some nodes were offline during this query: {offline_nodes}")
+            if 1 in offline_nodes and len(online_nodes) > 1:
+                st.info("✅ Complete data reconstructed from partition nodes")
+            elif 1 not in offline_nodes:
+                st.info("✅ Complete data available from central node")
+
+
+def _render_pages(table, key):
+    """Render a table one page at a time in a fixed-size grid"""
+    # Only the current page is sent to the browser
+    page_col1, page_col2 = st.columns(2)
+    with page_col1:
+        page_size = st.selectbox("Page size", [25, 50, 100], index=1, key=f"{key}_page_size")
+    total_pages = max(1, (table.num_rows + page_size - 1) // page_size)
+    with page_col2:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key=f"{key}_page")
+
+    page_data = table.slice((page - 1) * page_size, page_size)
+    column_config = {column: st.column_config.Column(width=COLUMN_WIDTHS[column]) for column in page_data.column_names}
+    st.dataframe(
+        page_data,
+        width=GRID_WIDTH,
+        height=GRID_HEIGHT,
+        hide_index=True,
+        column_config=column_config,
+        key=key
+    )
+    st.caption(f"Page {page} of {total_pages}")
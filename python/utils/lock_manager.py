@@ -10,9 +10,31 @@ The lock manager coordinates locks across all three nodes to ensure consistency.
 """
 
 import mysql.connector
+import random
+import threading
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# Lock retry backoff: yield the CPU for the first few attempts (the lock holder
+# is usually a single short UPDATE), then sleep with jittered exponential backoff
+RETRY_SPIN_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 0.001  # seconds
+RETRY_BACKOFF_CAP = 0.05  # seconds
+
+
+def _retry_delay(attempt: int) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based) of a lock acquisition.
+    """
+    if attempt < RETRY_SPIN_ATTEMPTS:
+        return 0
+    return min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** (attempt - RETRY_SPIN_ATTEMPTS)) * (0.5 + random.random())
+
+
+class LockQueueFullError(Exception):
+    """Raised by acquire_lock when too many callers are already waiting for the lock"""
 
 
 class DistributedLockManager:
@@ -36,6 +58,10 @@ class DistributedLockManager:
         self.current_node_id = current_node_id
         self.available = True
         self._active_locks = {}  # Track locks we currently hold: {resource_id: [node_list]}
+        self._lock_waiters = {}  # Callers inside acquire_lock: {(resource_id, node): count}
+        self._lock_waiters_lock = threading.Lock()
+        self._local_locks = {}  # In-process lock per (resource_id, node), taken before the table lock
+        self._local_lock_owners = {}  # (resource_id, node) -> ident of the thread holding the local lock
         
         # Verify lock tables exist on all nodes
         self._initialize_lock_tables()
@@ -102,7 +128,8 @@ class DistributedLockManager:
         except Exception as e:
             raise Exception(f"Failed to connect to Node {node}: {e}")
     
-    def acquire_lock(self, resource_id: str, node: int, timeout: int = 30) -> bool:
+    def acquire_lock(self, resource_id: str, node: int, timeout: int = 30,
+                     max_queue_depth: Optional[int] = None) -> bool:
         """
         Acquire a lock on a specific resource at a specific node.
         
@@ -113,12 +140,111 @@ class DistributedLockManager:
             resource_id: Unique identifier for the resource (e.g., "trans_123", "account_456")
             node: Node number where the lock should be acquired
             timeout: Maximum seconds to wait for lock acquisition (default: 30)
+            max_queue_depth: Reject immediately if this many callers of this manager are
+                             already waiting for the same lock (default: no limit)
+            
+        Returns:
+            bool: True if lock acquired successfully, False otherwise
+            
+        Raises:
+            LockQueueFullError: If max_queue_depth callers are already waiting
+        """
+        waiter_key = (resource_id, node)
+        with self._lock_waiters_lock:
+            waiting = self._lock_waiters.get(waiter_key, 0)
+            if max_queue_depth is not None and waiting >= max_queue_depth:
+                print(f"[{self.current_node_id}] ✗ Lock queue full for {resource_id} on Node {node} ({waiting} waiting)")
+                raise LockQueueFullError(f"Lock queue full for {resource_id} on Node {node} ({waiting} waiting)")
+            self._lock_waiters[waiter_key] = waiting + 1
+            local_lock = self._local_locks.setdefault(waiter_key, threading.Lock())
+        
+        try:
+            # Writers in this process queue on the local lock first, so only one of
+            # them at a time polls the lock table. Like the table lock, it is
+            # re-entrant for the thread that already holds it.
+            took_local_lock = False
+            if self._local_lock_owners.get(waiter_key) != threading.get_ident():
+                if not local_lock.acquire(timeout=timeout):
+                    print(f"[{self.current_node_id}] Lock acquisition timeout for {resource_id} on Node {node}")
+                    return False
+                self._local_lock_owners[waiter_key] = threading.get_ident()
+                took_local_lock = True
+            
+            acquired = False
+            try:
+                acquired = self._acquire_lock(resource_id, node, timeout)
+                return acquired
+            finally:
+                if took_local_lock and not acquired:
+                    self._release_local_lock(waiter_key)
+        finally:
+            with self._lock_waiters_lock:
+                self._lock_waiters[waiter_key] -= 1
+                if not self._lock_waiters[waiter_key]:
+                    del self._lock_waiters[waiter_key]
+    
+    def acquire_local_lock(self, resource_id: str, node: int, timeout: int = 30) -> bool:
+        """
+        Acquire only the in-process lock on a resource, without the distributed_lock table.
+        
+        For writers that need to be serialized against other threads of this
+        process but can leave cross-process conflicts to InnoDB's row locks.
+        
+        Args:
+            resource_id: Unique identifier for the resource
+            node: Node number the resource lives on
+            timeout: Maximum seconds to wait for the lock (default: 30)
+            
+        Returns:
+            bool: True if the lock is held by the calling thread, False on timeout
+        """
+        key = (resource_id, node)
+        with self._lock_waiters_lock:
+            local_lock = self._local_locks.setdefault(key, threading.Lock())
+        
+        if self._local_lock_owners.get(key) == threading.get_ident():
+            return True
+        if not local_lock.acquire(timeout=timeout):
+            print(f"[{self.current_node_id}] Local lock acquisition timeout for {resource_id} on Node {node}")
+            return False
+        self._local_lock_owners[key] = threading.get_ident()
+        return True
+    
+    def release_local_lock(self, resource_id: str, node: int):
+        """
+        Release an in-process lock taken with acquire_local_lock.
+        
+        Args:
+            resource_id: Unique identifier for the resource
+            node: Node number the resource lives on
+        """
+        self._release_local_lock((resource_id, node))
+    
+    def _release_local_lock(self, key: Tuple[str, int]):
+        """
+        Release the in-process lock for (resource_id, node) if the calling thread holds it.
+        
+        Args:
+            key: (resource_id, node) of the lock
+        """
+        if self._local_lock_owners.get(key) == threading.get_ident():
+            del self._local_lock_owners[key]
+            self._local_locks[key].release()
+    
+    def _acquire_lock(self, resource_id: str, node: int, timeout: int) -> bool:
+        """
+        Wait for and take a lock on a resource at a node (see acquire_lock).
+        
+        Args:
+            resource_id: Unique identifier for the resource
+            node: Node number where the lock should be acquired
+            timeout: Maximum seconds to wait for lock acquisition
             
         Returns:
             bool: True if lock acquired successfully, False otherwise
         """
         lock_name = f"lock_{resource_id}"
-        start_time = time.time()
+        start_time = time.monotonic()
         
         select_lock_sql = """
         SELECT locked_by, lock_time 
@@ -151,8 +277,9 @@ class DistributedLockManager:
             cursor = conn.cursor(dictionary=True)
             
             # Loop until we acquire the lock or timeout
+            attempt = 0
             while True:
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 
                 if elapsed > timeout:
                     print(f"[{self.current_node_id}] Lock acquisition timeout for {resource_id} on Node {node}")
@@ -183,7 +310,8 @@ class DistributedLockManager:
                         except mysql.connector.IntegrityError:
                             # Should not happen with FOR UPDATE, but handle gracefully
                             conn.rollback()
-                            time.sleep(0.1)
+                            time.sleep(_retry_delay(attempt))
+                            attempt += 1
                             continue
                     
                     else:
@@ -213,8 +341,10 @@ class DistributedLockManager:
                         
                         # Lock is held by another active session - rollback and wait
                         conn.rollback()
-                        print(f"[{self.current_node_id}] Waiting for lock on {resource_id} at Node {node} (held by {result['locked_by']})")
-                        time.sleep(0.5)
+                        if attempt == 0:
+                            print(f"[{self.current_node_id}] Waiting for lock on {resource_id} at Node {node} (held by {result['locked_by']})")
+                        time.sleep(_retry_delay(attempt))
+                        attempt += 1
                         continue
                 
                 except Exception as e:
@@ -274,6 +404,8 @@ class DistributedLockManager:
             return False
         
         finally:
+            self._release_local_lock((resource_id, node))
+            
             if cursor:
                 cursor.close()
             if conn:
@@ -339,7 +471,7 @@ class DistributedLockManager:
         Returns:
             bool: True if locks acquired on at least 1 node, False if all nodes failed
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         acquired_nodes = []
         failed_nodes = []
         
@@ -347,7 +479,7 @@ class DistributedLockManager:
         
         # FAULT TOLERANT: Try each node, continue even if some fail
         for node in nodes:
-            remaining_timeout = timeout - (time.time() - start_time)
+            remaining_timeout = timeout - (time.monotonic() - start_time)
             
             if remaining_timeout <= 0:
                 print(f"[{self.current_node_id}] ⏱️ Lock acquisition timeout reached")
@@ -432,6 +564,201 @@ class DistributedLockManager:
             print(f"[{self.current_node_id}] ⚠️ 2PL SHRINKING PHASE: No locks could be released")
             return False
     
+    def acquire_locks(self, resource_ids: List[Tuple[str, int]], timeout: int = 30) -> bool:
+        """
+        Acquire a batch of locks, all-or-nothing.
+        
+        Locks on the same node are taken together in one transaction over one
+        connection instead of one acquire_lock() call each. Nodes are visited in
+        ascending order so two overlapping batches cannot deadlock each other.
+        If any node's batch cannot be acquired, every lock already taken by this
+        call is released again with release_locks().
+        
+        Args:
+            resource_ids: List of (resource_id, node) pairs to lock
+            timeout: Maximum seconds to wait for the whole batch (also the stale lock age)
+            
+        Returns:
+            bool: True if every lock was acquired, False otherwise (nothing is held)
+        """
+        start_time = time.monotonic()
+        by_node = {}
+        for resource_id, node in resource_ids:
+            by_node.setdefault(node, []).append(resource_id)
+        
+        acquired = []
+        for node in sorted(by_node):
+            remaining_timeout = timeout - (time.monotonic() - start_time)
+            
+            if remaining_timeout <= 0 or not self._acquire_node_batch(by_node[node], node, remaining_timeout, timeout):
+                print(f"[{self.current_node_id}] ✗ Could not acquire lock batch on Node {node}, releasing {len(acquired)} acquired locks")
+                self.release_locks(acquired)
+                return False
+            
+            acquired.extend((resource_id, node) for resource_id in by_node[node])
+        
+        return True
+    
+    def _acquire_node_batch(self, resource_ids: List[str], node: int, wait: float, stale_after: int) -> bool:
+        """
+        Acquire locks on several resources at one node in a single transaction.
+        
+        Args:
+            resource_ids: Resources to lock on this node
+            node: Node number where the locks should be acquired
+            wait: Maximum seconds to wait while another owner holds one of the locks
+            stale_after: Age in seconds after which another owner's lock is replaced
+            
+        Returns:
+            bool: True if all locks acquired on the node, False otherwise
+        """
+        lock_names = [f"lock_{resource_id}" for resource_id in resource_ids]
+        placeholders = ", ".join(["%s"] * len(lock_names))
+        deadline = time.monotonic() + wait
+        
+        select_locks_sql = f"""
+        SELECT lock_name, locked_by, lock_time 
+        FROM distributed_lock 
+        WHERE lock_name IN ({placeholders})
+        FOR UPDATE
+        """
+        
+        insert_lock_sql = """
+        INSERT INTO distributed_lock (lock_name, locked_by) 
+        VALUES (%s, %s)
+        """
+        
+        conn = None
+        cursor = None
+        
+        try:
+            conn = self._get_connection(node)
+            cursor = conn.cursor(dictionary=True)
+            
+            attempt = 0
+            while True:
+                try:
+                    cursor.execute("START TRANSACTION")
+                    cursor.execute(select_locks_sql, lock_names)
+                    held = {row['lock_name']: row for row in cursor.fetchall()}
+                    
+                    now = datetime.now()
+                    blocking = [
+                        row for row in held.values()
+                        if row['locked_by'] != self.current_node_id
+                        and (now - row['lock_time']).total_seconds() <= stale_after
+                    ]
+                    
+                    if blocking:
+                        # At least one lock is held by another active session - rollback and wait
+                        conn.rollback()
+                        if time.monotonic() >= deadline:
+                            print(f"[{self.current_node_id}] Lock batch acquisition timeout on Node {node}")
+                            return False
+                        if attempt == 0:
+                            print(f"[{self.current_node_id}] Waiting for lock batch on Node {node} (held by {blocking[0]['locked_by']})")
+                        time.sleep(_retry_delay(attempt))
+                        attempt += 1
+                        continue
+                    
+                    # Replace stale locks of other owners, keep the ones we already hold
+                    stale = [name for name, row in held.items() if row['locked_by'] != self.current_node_id]
+                    if stale:
+                        print(f"[{self.current_node_id}] Removing {len(stale)} stale locks at Node {node}")
+                        cursor.execute(
+                            f"DELETE FROM distributed_lock WHERE lock_name IN ({', '.join(['%s'] * len(stale))})",
+                            stale
+                        )
+                    
+                    missing = [name for name in lock_names if name not in held or name in stale]
+                    if missing:
+                        cursor.executemany(insert_lock_sql, [(name, self.current_node_id) for name in missing])
+                    conn.commit()
+                    
+                    # Track these locks
+                    for resource_id in resource_ids:
+                        if resource_id not in self._active_locks:
+                            self._active_locks[resource_id] = []
+                        if node not in self._active_locks[resource_id]:
+                            self._active_locks[resource_id].append(node)
+                    
+                    print(f"[{self.current_node_id}] ✓ Acquired {len(resource_ids)} locks at Node {node}")
+                    return True
+                
+                except mysql.connector.IntegrityError:
+                    # Another session inserted one of the locks first - retry
+                    conn.rollback()
+                    time.sleep(_retry_delay(attempt))
+                    attempt += 1
+                    continue
+                
+                except Exception as e:
+                    print(f"[{self.current_node_id}] Error acquiring lock batch on Node {node}: {e}")
+                    conn.rollback()
+                    return False
+        
+        except Exception as e:
+            print(f"[{self.current_node_id}] Failed to connect to Node {node} for lock acquisition: {e}")
+            return False
+        
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+    
+    def release_locks(self, resource_ids: List[Tuple[str, int]]) -> bool:
+        """
+        Release a batch of locks with one DELETE per node.
+        
+        Args:
+            resource_ids: List of (resource_id, node) pairs to release
+            
+        Returns:
+            bool: True if every node's batch was released, False otherwise
+        """
+        by_node = {}
+        for resource_id, node in resource_ids:
+            by_node.setdefault(node, []).append(resource_id)
+        
+        all_released = True
+        
+        for node, node_resource_ids in by_node.items():
+            lock_names = [f"lock_{resource_id}" for resource_id in node_resource_ids]
+            conn = None
+            cursor = None
+            
+            try:
+                conn = self._get_connection(node)
+                cursor = conn.cursor()
+                
+                cursor.execute(
+                    f"DELETE FROM distributed_lock WHERE lock_name IN ({', '.join(['%s'] * len(lock_names))}) AND locked_by = %s",
+                    (*lock_names, self.current_node_id)
+                )
+                conn.commit()
+                
+                # Remove from tracking
+                for resource_id in node_resource_ids:
+                    if resource_id in self._active_locks and node in self._active_locks[resource_id]:
+                        self._active_locks[resource_id].remove(node)
+                        if not self._active_locks[resource_id]:
+                            del self._active_locks[resource_id]
+                
+                print(f"[{self.current_node_id}] ✓ Released {len(lock_names)} locks at Node {node}")
+            
+            except Exception as e:
+                all_released = False
+                print(f"[{self.current_node_id}] Error releasing lock batch on Node {node}: {e}")
+            
+            finally:
+                if cursor:
+                    cursor.close()
+                if conn:
+                    conn.close()
+        
+        return all_released
+    
     def _sync_locks_to_recovered_nodes(self, resource_id: str, healthy_nodes: list, failed_nodes: list):
         """
         Actively sync existing locks to nodes that have recovered.
@@ -578,8 +905,10 @@ class DistributedLockManager:
                 if conn:
                     conn.close()
         
-        # Clear tracking
+        # Clear tracking, and drop the in-process locks this thread still holds
         self._active_locks = {}
+        for key in list(self._local_lock_owners):
+            self._release_local_lock(key)
         
         if total_released > 0:
             print(f"[{self.current_node_id}] ✓ Released {total_released} total locks across all nodes")
@@ -114,16 +114,13 @@ class RecoveryManager:
             if backup_node:
                 print(f"Storing cross-backup in Node {backup_node} (original in Node {self.current_node_id})")
                 
-                # Get configuration for the backup node
-                from python.db.db_config import get_node_config
-                backup_config = get_node_config(backup_node)
+                from python.db.db_config import get_db_connection
                 
                 connection = None
                 cursor = None
                 try:
-                    # Connect to the backup node
-                    import mysql.connector
-                    connection = mysql.connector.connect(**backup_config)
+                    # Borrow a pooled connection to the backup node
+                    connection = get_db_connection(backup_node)
                     cursor = connection.cursor()
                     
                     insert_sql = """
@@ -180,14 +177,12 @@ class RecoveryManager:
             try:
                 print(f"Checking Node {check_node_id} for recovery logs targeting Node {self.current_node_id}...")
                 
-                # Get node configuration
-                from python.db.db_config import get_node_config
-                node_config = get_node_config(check_node_id)
+                from python.db.db_config import get_db_connection
                 
                 connection = None
                 cursor = None
                 try:
-                    connection = mysql.connector.connect(**node_config)
+                    connection = get_db_connection(check_node_id)
                     cursor = connection.cursor(dictionary=True)
                     
                     # Get pending recovery logs that target this node
@@ -232,16 +227,20 @@ class RecoveryManager:
         
         # Deduplicate logs by transaction_hash to avoid processing the same transaction multiple times
         unique_logs = {}
+        duplicate_log_ids = {}  # node -> log_ids of duplicates found in that node
         for log in all_pending_logs:
             tx_hash = log.get('transaction_hash', '')
             if tx_hash and tx_hash in unique_logs:
                 print(f"Skipping duplicate log {log['log_id']} from Node {log['found_in_node']} (same hash as log {unique_logs[tx_hash]['log_id']} from Node {unique_logs[tx_hash]['found_in_node']})")
-                # Mark the duplicate as completed to prevent re-processing
-                self._mark_recovery_status_in_node(log['found_in_node'], log['log_id'], 'COMPLETED', "Duplicate transaction - skipped during deduplication")
+                duplicate_log_ids.setdefault(log['found_in_node'], []).append(log['log_id'])
                 recovery_results['skipped'] += 1
             else:
                 unique_logs[tx_hash] = log
         
+        # Mark the duplicates as completed to prevent re-processing (one batch per node)
+        for node_id, log_ids in duplicate_log_ids.items():
+            self._mark_recovery_statuses_in_node(node_id, log_ids, 'COMPLETED', "Duplicate transaction - skipped during deduplication")
+        
         deduplicated_logs = list(unique_logs.values())
         recovery_results['total_logs'] = len(all_pending_logs)
         recovery_results['unique_logs'] = len(deduplicated_logs)
@@ -439,11 +438,9 @@ class RecoveryManager:
         connection = None
         cursor = None
         try:
-            # Get configuration for the specified node
-            from python.db.db_config import get_node_config
-            node_config = get_node_config(node_id)
-            
-            connection = mysql.connector.connect(**node_config)
+            # Borrow a pooled connection to the specified node
+            from python.db.db_config import get_db_connection
+            connection = get_db_connection(node_id)
             cursor = connection.cursor()
             
             update_sql = """
@@ -455,7 +452,39 @@ class RecoveryManager:
             cursor.execute(update_sql, (status, error_message, log_id))
             connection.commit()
             
-        except Error as e:
+        except Exception as e:
+            print(f"Failed to update recovery status in Node {node_id}: {e}")
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+    
+    def _mark_recovery_statuses_in_node(self, node_id: int, log_ids: List[int], status: str, error_message: str = None):
+        """Mark several recovery logs with the same final status in specified node, in one UPDATE"""
+        if not log_ids:
+            return
+        connection = None
+        cursor = None
+        try:
+            # Borrow a pooled connection to the specified node
+            from python.db.db_config import get_db_connection
+            connection = get_db_connection(node_id)
+            cursor = connection.cursor()
+            
+            # One statement for all logs (executemany only batches INSERT/REPLACE;
+            # for an UPDATE it would still run one round trip per log)
+            placeholders = ", ".join(["%s"] * len(log_ids))
+            update_sql = f"""
+                UPDATE recovery_log 
+                SET status = %s, error_message = %s
+                WHERE log_id IN ({placeholders})
+            """
+            
+            cursor.execute(update_sql, (status, error_message, *log_ids))
+            connection.commit()
+            
+        except Exception as e:
             print(f"Failed to update recovery status in Node {node_id}: {e}")
         finally:
             if cursor:
@@ -493,11 +522,9 @@ class RecoveryManager:
         connection = None
         cursor = None
         try:
-            # Get configuration for the specified node
-            from python.db.db_config import get_node_config
-            node_config = get_node_config(node_id)
-            
-            connection = mysql.connector.connect(**node_config)
+            # Borrow a pooled connection to the specified node
+            from python.db.db_config import get_db_connection
+            connection = get_db_connection(node_id)
             cursor = connection.cursor()
             
             update_sql = """
@@ -509,7 +536,7 @@ class RecoveryManager:
             cursor.execute(update_sql, (error_message, log_id))
             connection.commit()
             
-        except Error as e:
+        except Exception as e:
             print(f"Failed to increment retry count in Node {node_id}: {e}")
         finally:
             if cursor:
@@ -873,13 +900,12 @@ class RecoveryManager:
         # Check all nodes
         for node_id in [1, 2, 3]:
             try:
-                from python.db.db_config import get_node_config
-                node_config = get_node_config(node_id)
+                from python.db.db_config import get_db_connection
                 
                 connection = None
                 cursor = None
                 try:
-                    connection = mysql.connector.connect(**node_config)
+                    connection = get_db_connection(node_id)
                     cursor = connection.cursor()
                     
                     status_sql = """
@@ -898,7 +924,7 @@ class RecoveryManager:
                     
                     global_status['nodes'][f'node_{node_id}'] = node_status
                     
-                except Error as e:
+                except Exception as e:
                     global_status['nodes'][f'node_{node_id}'] = {'error': f'Could not connect: {str(e)}'}
                 finally:
                     if cursor:
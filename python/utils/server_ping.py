@@ -4,6 +4,7 @@ Server Ping Utility - Check database node connectivity
 
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
 import os
@@ -11,7 +12,7 @@ import os
 # Add parent directory to path for imports (fixes Streamlit Cloud deployment)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from python.db.db_config import get_db_connection
+from python.db.db_config import get_db_connection, get_table_version
 
 
 class NodePinger:
@@ -117,3 +118,108 @@ class NodePinger:
         """
         return self.node_status.copy()
 
+
+
+class NodeCountRefresher:
+    """Background thread that keeps the latest trans row count of every node"""
+
+    def __init__(self, interval=5):
+        """
+        Initialize the count refresher
+
+        Args:
+            interval: Time in seconds between refreshes (default: 5)
+        """
+        self.interval = interval
+        self.running = False
+        self.thread = None
+        self.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="node-count")
+        self.counts = {1: None, 2: None, 3: None}
+        self.versions = {1: None, 2: None, 3: None}
+        self.last_refresh = {1: None, 2: None, 3: None}
+
+    def count_rows(self, node):
+        """
+        Count the rows in a node's trans table
+
+        Args:
+            node: Node number (1, 2, or 3)
+
+        Returns:
+            int: Row count, or None if the node could not be reached
+        """
+        try:
+            # Skip the COUNT(*) scan if the table has not changed since the last pass
+            version = get_table_version(node)
+            if version is not None and version == self.versions[node] and self.counts[node] is not None:
+                return self.counts[node]
+
+            conn = get_db_connection(node)
+            try:
+                # Closed on every path so a failed COUNT still hands the connection back to the pool
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SELECT COUNT(*) FROM trans")
+                    count = cursor.fetchone()[0]
+                finally:
+                    cursor.close()
+            finally:
+                conn.close()
+            self.versions[node] = version
+            return int(count)
+        except Exception:
+            return None
+
+    def refresh_all(self):
+        """Count rows on all nodes concurrently and store the results"""
+        futures = {node: self.executor.submit(self.count_rows, node) for node in [1, 2, 3]}
+        for node, future in futures.items():
+            count = future.result()
+            self.counts[node] = count
+            # Keep the time of the last successful count so stale values can be flagged
+            if count is not None:
+                self.last_refresh[node] = datetime.now()
+
+    def _refresh_loop(self):
+        """Background loop that refreshes counts at regular intervals"""
+        while self.running:
+            try:
+                self.refresh_all()
+            except Exception as e:
+                print(f"Error during count refresh: {e}")
+
+            # Sleep for the interval
+            time.sleep(self.interval)
+
+    def start(self):
+        """Start the background refresh thread"""
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=self.interval + 1)
+
+    def get_counts(self):
+        """
+        Get the latest row counts
+
+        Returns:
+            dict: Row counts {node_id: count or None}
+        """
+        return self.counts.copy()
+
+    def get_last_refresh(self):
+        """
+        Get the time each node was last counted successfully
+
+        Returns:
+            dict: Refresh times {node_id: datetime or None}
+        """
+        return self.last_refresh.copy()